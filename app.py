@@ -1,17 +1,37 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
+import altair as alt
 import random
-import matplotlib.font_manager as fm
 import os
+import threading
+import profiling
+from charts import BAR_CHARTS, render_bar_chart
+from epl_analytics.data import load_season, build_match_store
+from epl_analytics.columnar import (
+    pack_matches, arrays_to_frame, standings_from_arrays, match_index_from_arrays, probability_matrix_from_arrays,
+)
+from epl_analytics.index import index_team_id, pair_rows, team_rows, head_to_head_rows
+from epl_analytics.standings import CUMULATIVE_STATS, build_standings_cube, standings_at
+from epl_analytics.probabilities import (
+    odds_to_probabilities, probability_table, calculate_win_probabilities, calculate_game_probabilities,
+)
+from epl_analytics.head_to_head import head_to_head_summary
+from epl_analytics.ratings import (
+    new_rating_state, update_ratings, rating_table, rating_win_probabilities, rating_game_probabilities,
+    rating_win_matrix, backtest_log_loss,
+)
+from epl_analytics.cards import format_match_rows
+from epl_analytics.live import open_live_season, poll_live_season, attach_live_ratings, live_standings
+from epl_analytics.form import build_team_matches, rolling_form, team_form_rows
+from epl_analytics.simulation import (
+    ROUND_NAMES, bracket_win_matrix, simulate_bracket, simulate_bracket_parallel, bracket_probabilities,
+    simulate_season, projection_table,
+)
 
-# 폰트 설정
-font_path = "fonts/NanumGothic.ttf"
-if os.path.exists(font_path):
-    font_prop = fm.FontProperties(fname=font_path)
-    plt.rcParams['font.family'] = font_prop.get_name()
-    plt.rcParams['axes.unicode_minus'] = False
+# 성능 측정 (EPL_PROFILE=1 환경 변수 또는 ?profile=1 쿼리 파라미터로 활성화)
+PROFILE_LOG = os.environ.get("EPL_PROFILE_LOG", "profile_log.jsonl")
+profiling.start_rerun(os.environ.get("EPL_PROFILE") == "1" or st.query_params.get("profile") == "1")
 
 # 시즌별 CSV 파일 목록
 season_files = {
@@ -22,54 +42,198 @@ season_files = {
     "2024-2025 시즌": "epl_24_25.csv",
 }
 
-# 시즌 선택 및 상태 초기화
+# 시즌 선택 및 시즌별 상태 (시즌을 바꿔도 다른 시즌의 게임 진행 상황과 시뮬레이션 결과는 그대로 유지)
 selected_season = st.sidebar.selectbox("시즌 선택", list(season_files.keys()))
-if "active_season" not in st.session_state or st.session_state.active_season != selected_season:
-    st.session_state.clear()
-    st.session_state.active_season = selected_season
-
-df = pd.read_csv(season_files[selected_season])
-
-# 리그 순위 계산 함수
-def calculate_standings(df):
-    teams = df["홈 팀"].unique()
-    standings = {team: {"경기": 0, "승": 0, "무": 0, "패": 0, "득점": 0, "실점": 0, "승점": 0} for team in teams}
-
-    for _, row in df.iterrows():
-        home, away = row["홈 팀"], row["원정 팀"]
-        home_score, away_score = row["홈 팀 득점"], row["원정 팀 득점"]
-        result = row["경기 결과"]
-
-        standings[home]["경기"] += 1
-        standings[away]["경기"] += 1
-
-        standings[home]["득점"] += home_score
-        standings[home]["실점"] += away_score
-        standings[away]["득점"] += away_score
-        standings[away]["실점"] += home_score
-
-        if result == "H":
-            standings[home]["승"] += 1
-            standings[home]["승점"] += 3
-            standings[away]["패"] += 1
-        elif result == "A":
-            standings[away]["승"] += 1
-            standings[away]["승점"] += 3
-            standings[home]["패"] += 1
-        else:
-            standings[home]["무"] += 1
-            standings[away]["무"] += 1
-            standings[home]["승점"] += 1
-            standings[away]["승점"] += 1
-
-    standings_df = pd.DataFrame.from_dict(standings, orient="index")
-    standings_df["득실차"] = standings_df["득점"] - standings_df["실점"]
-    standings_df.index.name = "구단"
-    standings_df.reset_index(inplace=True)
-    standings_df = standings_df[["구단", "경기", "승", "무", "패", "득점", "실점", "득실차", "승점"]]
-    return standings_df.sort_values(by=["승점", "득실차", "득점"], ascending=False)
-
-df_standings = calculate_standings(df)
+season_state = st.session_state.setdefault("season_states", {}).setdefault(selected_season, {})
+
+# 서버 프로세스에서 한 번만 만들어 모든 세션이 읽기 전용으로 공유하는 데이터
+# (cache_data와 달리 호출마다 복사하지 않으므로 반환값을 수정하면 안 됨 → 배열은 쓰기 금지로 표시)
+def read_only(value):
+    items = value.values() if isinstance(value, dict) else value if isinstance(value, tuple) else [value]
+    for item in items:
+        if isinstance(item, np.ndarray):
+            item.setflags(write=False)
+    return value
+
+# 실시간 추가 모드 (EPL_LIVE=1): 마지막 시즌 파일 끝에 붙는 경기만 읽어 순위/인덱스/확률/누적 순위/레이팅을 이어서 갱신
+# 상태는 서버 프로세스에 하나만 두고 재실행마다 파일 크기만 확인 (바뀌었을 때만 새 상태로 교체)
+LIVE_PATH = season_files[list(season_files)[-1]] if os.environ.get("EPL_LIVE") == "1" else None
+
+@st.cache_resource(show_spinner=False)
+def get_live_season(path):
+    return {"lock": threading.Lock(), "state": open_live_season(path)}
+
+# 시즌 파일의 캐시 키 (실시간 모드 파일은 읽은 위치, 그 외에는 크기/수정 시각)
+# 키가 바뀐 파일에 걸린 캐시만 다시 계산되고 나머지 시즌의 캐시는 그대로 사용
+def season_source(path):
+    if path == LIVE_PATH:
+        return (path, "live", live_state["offset"])
+    stat = os.stat(path)
+    return (path, stat.st_size, stat.st_mtime_ns)
+
+# 시즌 경기 압축 배열 (서버 프로세스에는 이것만 두고 세션 간 공유)
+# 파일이 바뀌면 키가 달라짐, 실시간 모드에서 지난 버전은 오래된 순으로 제거
+@profiling.tracked_cache(st.cache_resource(max_entries=16, show_spinner=False))
+def get_season_arrays(path, size, mtime_ns):
+    if path == LIVE_PATH:
+        return read_only(pack_matches(live_state["df"], tuple(live_state["index"]["teams"])))
+    return read_only(pack_matches(load_season(path)))
+
+# 시즌 데이터 DataFrame (캐시 미스로 파생 테이블을 만들 때만 압축 배열에서 만들고 보관하지 않음)
+def get_season(path, size, mtime_ns):
+    if path == LIVE_PATH:
+        return live_state["df"]
+    return arrays_to_frame(get_season_arrays(path, size, mtime_ns))
+
+def load_selected_season(path):
+    return get_season_arrays(*season_source(path))
+
+# 시즌 순서대로 Elo 레이팅 누적 (앞 시즌까지의 상태는 캐시에서 재사용하므로 바뀐 시즌만 다시 반영)
+# 반환값: 해당 시즌까지 반영한 상태, 해당 시즌 경기의 경기 전 확률
+@profiling.tracked_cache(st.cache_resource(max_entries=32, show_spinner=False))
+def get_rating_state(season_sources):
+    if not season_sources:
+        return new_rating_state(), np.empty((0, 3))
+    *previous, (season, source) = season_sources
+    return update_ratings(get_rating_state(tuple(previous))[0], get_season(*source), season)
+
+# 실시간 모드 시즌의 레이팅은 앞 시즌까지의 레이팅 상태를 체크포인트로 연결해 두고 추가 경기만 이어서 반영
+# (처음 열 때와 앞 시즌 파일이 바뀌었을 때만 이 시즌 경기를 다시 반영)
+def refresh_live_season(path):
+    live = get_live_season(path)
+    *previous, season = season_files
+    base = get_rating_state(tuple((name, season_source(season_files[name])) for name in previous))[0]
+    with live["lock"]:
+        state, _ = poll_live_season(live["state"])
+        if state.get("rating_base", (None,))[0] is not base:
+            state = attach_live_ratings(state, base, season)
+        if state is not live["state"]:
+            for key in ["index", "probs", "cube", "rating_probs"]:
+                read_only(state[key])
+            live["state"] = state
+    return live["state"]
+
+live_state = refresh_live_season(LIVE_PATH) if LIVE_PATH else None
+profiling.checkpoint("실시간 갱신")
+
+season_arrays = load_selected_season(season_files[selected_season])
+profiling.checkpoint("시즌 데이터 로드")
+if LIVE_PATH:
+    st.sidebar.caption(f"실시간 모드: {os.path.basename(LIVE_PATH)} {len(live_state['df'])}경기 반영")
+
+# 전체 시즌 통합 데이터 (모든 세션이 공유)
+ALL_SEASONS = "전체 시즌"
+
+# 통합 데이터도 압축 배열로만 보관 (팀 번호는 build_match_store의 고정 팀 ID, 화면에는 필요한 행만 DataFrame으로 만듦)
+@profiling.tracked_cache(st.cache_resource(max_entries=16, show_spinner=False))
+def get_store_arrays(season_sources):
+    store, team_names = build_match_store([(season, get_season(*source)) for season, source in season_sources])
+    return read_only(pack_matches(store, tuple(team_names)))
+
+def season_sources():
+    return tuple((season, season_source(path)) for season, path in season_files.items())
+
+def load_store_arrays():
+    return get_store_arrays(season_sources())
+
+# 페이지별 분석 범위 선택 (선택 시즌 / 전체 시즌)
+def select_scope(key):
+    scope = st.radio("분석 범위", [selected_season, ALL_SEASONS], horizontal=True, key=key)
+    if scope == ALL_SEASONS:
+        store_arrays = load_store_arrays()
+        return store_arrays, load_store_index(), load_store_probabilities(), sorted(store_arrays["teams"]), True
+    return season_arrays, season_index, season_probs, sorted(season_arrays["teams"])[:20], False  # 20개 구단
+
+# 전체 분석 막대 그래프 이미지 (시즌/기준 날짜/지표별로 한 번만 렌더링, 오래된 항목부터 제거)
+@profiling.tracked_cache(st.cache_data(max_entries=64, show_spinner=False))
+def get_bar_chart(season, date, column, labels, values, color):
+    return render_bar_chart(labels, values, color)
+
+# 날짜별 누적 순위 (시즌 파일마다 한 번만 계산)
+@profiling.tracked_cache(st.cache_resource(show_spinner=False))
+def get_standings_cube(path, size, mtime_ns):
+    return read_only(build_standings_cube(get_season(path, size, mtime_ns)))
+
+def load_standings_cube(path):
+    if path == LIVE_PATH:
+        return live_state["cube"]
+    return get_standings_cube(*season_source(path))
+
+# 데이터셋마다 한 번만 만들고 세션 간 공유 (읽기 전용)
+@profiling.tracked_cache(st.cache_resource(show_spinner=False))
+def get_season_index(path, size, mtime_ns):
+    return read_only(match_index_from_arrays(get_season_arrays(path, size, mtime_ns)))
+
+@profiling.tracked_cache(st.cache_resource(max_entries=16, show_spinner=False))
+def get_store_index(season_sources):
+    return read_only(match_index_from_arrays(get_store_arrays(season_sources)))
+
+@profiling.tracked_cache(st.cache_resource(show_spinner=False))
+def get_season_probabilities(path, size, mtime_ns):
+    return read_only(probability_matrix_from_arrays(get_season_arrays(path, size, mtime_ns)))
+
+@profiling.tracked_cache(st.cache_resource(max_entries=16, show_spinner=False))
+def get_store_probabilities(season_sources):
+    return read_only(probability_matrix_from_arrays(get_store_arrays(season_sources)))
+
+def load_season_index(path):
+    if path == LIVE_PATH:
+        return live_state["index"]
+    return get_season_index(*season_source(path))
+
+def load_store_index():
+    return get_store_index(season_sources())
+
+def load_season_probabilities(path):
+    if path == LIVE_PATH:
+        return live_state["probs"]
+    return get_season_probabilities(*season_source(path))
+
+def load_store_probabilities():
+    return get_store_probabilities(season_sources())
+
+# 팀-경기 롱 포맷 테이블 (데이터셋마다 한 번만 만들고 세션 간 공유)
+@profiling.tracked_cache(st.cache_resource(max_entries=16, show_spinner=False))
+def get_season_team_matches(path, size, mtime_ns):
+    return build_team_matches(get_season(path, size, mtime_ns))
+
+@profiling.tracked_cache(st.cache_resource(max_entries=16, show_spinner=False))
+def get_store_team_matches(season_sources):
+    return build_team_matches(arrays_to_frame(get_store_arrays(season_sources)))
+
+def load_team_matches(all_seasons=False):
+    if all_seasons:
+        return get_store_team_matches(season_sources())
+    return get_season_team_matches(*season_source(season_files[selected_season]))
+
+# 실시간 모드 시즌까지의 레이팅은 실시간 상태의 체크포인트를 사용
+def rating_checkpoint(season_sources):
+    if season_sources and season_sources[-1][1][0] == LIVE_PATH:
+        return live_state["ratings"], live_state["rating_probs"]
+    return get_rating_state(season_sources)
+
+@profiling.tracked_cache(st.cache_data(max_entries=16, show_spinner=False))
+def get_rating_backtest(season_sources):
+    elo_probs = np.concatenate([rating_checkpoint(season_sources[: i + 1])[1] for i in range(len(season_sources))])
+    return backtest_log_loss(arrays_to_frame(get_store_arrays(season_sources)), elo_probs)
+
+# 선택 시즌까지(전체 시즌이면 마지막 시즌까지)의 레이팅
+def load_rating_state(all_seasons=False):
+    sources = season_sources()
+    if not all_seasons:
+        sources = sources[: list(season_files).index(selected_season) + 1]
+    return rating_checkpoint(sources)[0]
+
+# 승부 예측 모델
+PREDICTORS = ["배당률", "Elo 레이팅"]
+
+season_index = load_season_index(season_files[selected_season])
+season_probs = load_season_probabilities(season_files[selected_season])
+profiling.checkpoint("인덱스/확률 행렬")
+
+# 실시간 모드 시즌은 이어서 갱신한 누적 순위의 마지막 날짜를 사용
+df_standings = live_standings(live_state) if season_files[selected_season] == LIVE_PATH else standings_from_arrays(season_arrays)
+profiling.checkpoint("순위 계산")
 
 st.title(f"{selected_season} EPL 분석 프로그램")
 menu = st.selectbox("", ["전체 분석", "팀별 분석", "승부 예측", "승부 예측 게임"])
@@ -77,79 +241,103 @@ menu = st.selectbox("", ["전체 분석", "팀별 분석", "승부 예측", "승
 if menu == "전체 분석":
     st.header("EPL 전체 분석")
 
+    standings_dates, cube_teams, standings_cube, standings_positions = load_standings_cube(season_files[selected_season])
+
+    # 기준 날짜 선택 (기본값: 시즌 마지막 경기일)
+    date_labels = standings_dates.strftime("%Y-%m-%d").tolist()
+    selected_date = st.select_slider("기준 날짜", options=date_labels, value=date_labels[-1])
+    date_pos = date_labels.index(selected_date)
+
     # 순위 컬럼 추가 및 순위 인덱스 설정
-    df_ranked = df_standings.copy()
+    df_ranked = standings_at(cube_teams, standings_cube, standings_positions, date_pos)
     df_ranked.insert(0, "순위", range(1, len(df_ranked) + 1))
     df_ranked = df_ranked.set_index("순위")
 
     st.dataframe(df_ranked)
 
-    if st.button("득점 그래프 보기"):
-        fig, ax = plt.subplots()
-        ax.bar(df_ranked["구단"], df_ranked["득점"])
-        ax.set_xticks(range(len(df_ranked["구단"])))
-        ax.set_xticklabels(df_ranked["구단"], rotation=90, fontproperties=font_prop)
-        st.pyplot(fig)
-
-    if st.button("승점 그래프 보기"):
-        fig, ax = plt.subplots()
-        ax.bar(df_ranked["구단"], df_ranked["승점"], color="orange")
-        ax.set_xticks(range(len(df_ranked["구단"])))
-        ax.set_xticklabels(df_ranked["구단"], rotation=90, fontproperties=font_prop)
-        st.pyplot(fig)
-
-    if st.button("승리 횟수 그래프 보기"):
-        fig, ax = plt.subplots()
-        ax.bar(df_ranked["구단"], df_ranked["승"], color="green")
-        ax.set_xticks(range(len(df_ranked["구단"])))
-        ax.set_xticklabels(df_ranked["구단"], rotation=90, fontproperties=font_prop)
-        st.pyplot(fig)
-
-
-
-
-# 팀별 분석 HTML 포맷팅 함수
-def format_match_row(date, home_team, home_score, away_score, away_team, highlight_team):
-    # 승리한 팀 볼드 처리
-    if home_score > away_score:
-        home_style = "font-weight:bold;"
-        away_style = "font-weight:normal;"
-    elif home_score < away_score:
-        home_style = "font-weight:normal;"
-        away_style = "font-weight:bold;"
-    else:  # 무승부
-        home_style = "font-weight:normal;"
-        away_style = "font-weight:normal;"
-
-    # highlight_team을 왼쪽으로 오게 강제
-    if home_team == highlight_team:
-        left_team, left_score, left_style, left_ha = home_team, home_score, home_style, "홈"
-        right_team, right_score, right_style, right_ha = away_team, away_score, away_style, "원정"
+    for button_label, column, color in BAR_CHARTS:
+        if st.button(button_label):
+            chart = get_bar_chart(
+                selected_season, selected_date, column, tuple(df_ranked["구단"]), tuple(df_ranked[column]), color
+            )
+            st.image(chart)
+
+    # 날짜별 순위 변화 그래프
+    st.subheader("순위 변화")
+    chart_teams = st.multiselect("구단 선택", list(cube_teams), default=df_ranked["구단"].head(5).tolist())
+    if chart_teams:
+        team_pos = [list(cube_teams).index(team) for team in chart_teams]
+        position_history = pd.DataFrame(
+            standings_positions[: date_pos + 1, team_pos],
+            index=standings_dates[: date_pos + 1],
+            columns=chart_teams,
+        )
+        position_history.index.name = "날짜"
+        position_long = position_history.reset_index().melt(id_vars="날짜", var_name="구단", value_name="순위")
+        position_chart = alt.Chart(position_long).mark_line(point=True).encode(
+            x=alt.X("날짜:T", title="날짜"),
+            y=alt.Y("순위:Q", title="순위", scale=alt.Scale(reverse=True, domain=[1, len(cube_teams)])),
+            color=alt.Color("구단:N", title="구단"),
+            tooltip=["날짜:T", "구단:N", "순위:Q"],
+        )
+        st.altair_chart(position_chart, use_container_width=True)
+
+    # 기준 날짜 이후 경기를 남은 경기로 보고 최종 순위 시뮬레이션
+    st.subheader("시즌 예측")
+    remaining = season_arrays["day"] > np.datetime64(standings_dates[date_pos], "D").astype(np.int64)
+    if not remaining.any():
+        st.caption("기준 날짜 이후 남은 경기가 없습니다. 기준 날짜를 앞으로 옮겨 보세요.")
     else:
-        left_team, left_score, left_style, left_ha = away_team, away_score, away_style, "원정"
-        right_team, right_score, right_style, right_ha = home_team, home_score, home_style, "홈"
-
-    return f"""
-    <div style="padding:10px; margin-bottom:10px; border:1px solid #ddd; border-radius:8px; background-color:#f9f9f9;">
-        <div style="font-size:0.85em; color:gray; margin-bottom:4px;">{date}</div>
-        <div style="font-size:0.85em; color:gray; margin-bottom:4px;">
-            <span>{left_ha}</span> vs <span>{right_ha}</span>
-        </div>
-        <div style="font-size:1.1em; display:flex; align-items:center; justify-content:center; gap:6px; color:black;">
-            <span style="{left_style}">{left_team}</span>
-            <span style="{left_style}">{left_score}</span>
-            <span style="font-weight:bold; margin: 0 6px;">vs</span>
-            <span style="{right_style}">{right_score}</span>
-            <span style="{right_style}">{right_team}</span>
-        </div>
-    </div>
-    """
+        st.caption(f"{selected_date} 이후 {remaining.sum()}경기를 배당률 확률로 시뮬레이션합니다. 승점 동률은 기준일의 득실차/득점 순위로 가립니다.")
+        n_projection = st.number_input("시뮬레이션 횟수", min_value=1000, max_value=500_000, value=100_000, step=10_000, key="projection_sims")
+        if st.button("남은 경기 시뮬레이션"):
+            home_idx, away_idx = season_arrays["home"], season_arrays["away"]
+            fixture_probs, _ = odds_to_probabilities(season_arrays["odds"][remaining].astype(np.float64))
+            fixture_probs[~np.isfinite(fixture_probs).all(axis=1)] = 1 / 3  # 배당률이 없으면 균등 확률
+            base_points = standings_cube[date_pos, :, CUMULATIVE_STATS.index("승점")]
+            tiebreak = len(cube_teams) - standings_positions[date_pos]
+            with st.spinner("시뮬레이션 중..."):
+                final_points, position_counts = simulate_season(
+                    base_points, tiebreak, home_idx[remaining], away_idx[remaining], fixture_probs, int(n_projection)
+                )
+            season_state["season_projection"] = (
+                selected_date,
+                projection_table(cube_teams, base_points, final_points, position_counts),
+                position_counts / int(n_projection),
+            )
+
+        if season_state.get("season_projection", (None,))[0] == selected_date:
+            _, projection, position_probs = season_state["season_projection"]
+            st.dataframe(
+                projection.style.format({
+                    "평균 승점": "{:.1f}", "승점 (5%)": "{:.0f}", "승점 (95%)": "{:.0f}", "평균 순위": "{:.1f}",
+                    "우승 확률": "{:.1%}", "4위 이내 확률": "{:.1%}", "강등 확률": "{:.1%}",
+                }),
+                use_container_width=True,
+                hide_index=True,
+            )
+            position_dist = pd.DataFrame(position_probs, index=cube_teams, columns=range(1, len(cube_teams) + 1))
+            position_dist.index.name = "구단"
+            position_long = position_dist.reset_index().melt(id_vars="구단", var_name="최종 순위", value_name="확률")
+            heatmap = alt.Chart(position_long).mark_rect().encode(
+                x=alt.X("최종 순위:O", title="최종 순위"),
+                y=alt.Y("구단:N", title="구단", sort=projection["구단"].tolist()),
+                color=alt.Color("확률:Q", scale=alt.Scale(scheme="blues")),
+                tooltip=["구단:N", "최종 순위:O", alt.Tooltip("확률:Q", format=".1%")],
+            )
+            st.altair_chart(heatmap, use_container_width=True)
+
+
+
+
+# 팀별 분석 경기 기록 페이지 크기 / 최근 폼 경기 수
+MATCH_PAGE_SIZES = [10, 20, 50]
+FORM_WINDOWS = [3, 5, 10]
 
 if menu == "팀별 분석":
     st.header("팀별 분석")
 
-    # 팀 선택 드롭다운
-    teams = sorted(df["홈 팀"].unique())[:20]  # 20개 구단
+    scope_arrays, scope_index, scope_probs, teams, all_seasons = select_scope("team_scope")
 
     col1, col2, col3 = st.columns([4,1,4])  # 좌측, 가운데, 우측 비율 조정 가능
 
@@ -164,85 +352,82 @@ if menu == "팀별 분석":
         right_team = st.selectbox("오른쪽 팀 선택", right_teams, index=len(right_teams) - 1)
 
 
-    # 날짜 컬럼 이름 지정
+    # 날짜 컬럼 이름 지정 (로더에서 datetime으로 변환됨)
     date_col = "날짜"
 
-    # 날짜 컬럼을 datetime 형식으로 변환 (한 번만)
-    if not pd.api.types.is_datetime64_any_dtype(df[date_col]):
-        df[date_col] = pd.to_datetime(df[date_col])
-
     if right_team == "모두":
         # 왼쪽 팀이 홈이거나 원정인 모든 경기
-        team_data = df[(df["홈 팀"] == left_team) | (df["원정 팀"] == left_team)]
+        team_data = arrays_to_frame(scope_arrays, team_rows(scope_index, left_team))
         st.subheader(f"{left_team} 전체 경기 기록 ({len(team_data)} 경기)")
     else:
         # 양 팀 간 경기만 필터링
-        team_data = df[
-            ((df["홈 팀"] == left_team) & (df["원정 팀"] == right_team)) |
-            ((df["홈 팀"] == right_team) & (df["원정 팀"] == left_team))
-        ]
+        team_data = arrays_to_frame(scope_arrays, head_to_head_rows(scope_index, left_team, right_team))
         st.subheader(f"{left_team} vs {right_team} 상대 전적 ({len(team_data)}경기)")
 
     # 날짜 내림차순 정렬
     team_data_sorted = team_data.sort_values(by=date_col, ascending=False)
 
-    # 경기 출력 함수 (이전 예시 사용)
-    for _, row in team_data_sorted.iterrows():
-        st.markdown(format_match_row(
-            date=row[date_col].strftime("%Y-%m-%d"),
-            home_team=row["홈 팀"],
-            home_score=row["홈 팀 득점"],
-            away_score=row["원정 팀 득점"],
-            away_team=row["원정 팀"],
-            highlight_team=left_team
-        ), unsafe_allow_html=True)
+    # 경기 카드는 페이지 단위로 한 번에 만들어 하나의 HTML 블록으로 출력
+    page_col1, page_col2 = st.columns(2)
+    with page_col1:
+        page_size = st.selectbox("페이지당 경기 수", MATCH_PAGE_SIZES, index=1)
+    n_pages = max(1, -(-len(team_data_sorted) // page_size))
+    with page_col2:
+        page = st.number_input("페이지", min_value=1, max_value=n_pages, value=1, step=1)
+    page_start = (page - 1) * page_size
+    page_data = team_data_sorted.iloc[page_start:page_start + page_size]
+
+    if len(page_data):
+        st.markdown(format_match_rows(page_data, left_team, date_col), unsafe_allow_html=True)
+        st.caption(f"{page_start + 1}–{page_start + len(page_data)} / 총 {len(team_data_sorted)}경기 ({page}/{n_pages} 페이지)")
 
     st.subheader("상대 전적 요약")
 
-    total_matches = len(team_data)
-    home_wins = ((team_data["홈 팀"] == left_team) & (team_data["경기 결과"] == "H")).sum()
-    away_wins = ((team_data["원정 팀"] == left_team) & (team_data["경기 결과"] == "A")).sum()
-    draws = (team_data["경기 결과"] == "D").sum()
-    losses = total_matches - (home_wins + away_wins + draws)
-    
+    record = head_to_head_summary(team_data, left_team)
+
     col1, col2, col3 = st.columns(3)
-    col1.metric("승", f"{home_wins + away_wins}")
-    col2.metric("무", f"{draws}")
-    col3.metric("패", f"{losses}")
-
-
-
-
-# 승률 계산 함수
-def calculate_win_probabilities(df, home_team, away_team):
-    # 두 시나리오: 1) home_team이 홈일 때, 2) away_team이 홈일 때
-    data1 = df[(df["홈 팀"] == home_team) & (df["원정 팀"] == away_team)]
-    data2 = df[(df["홈 팀"] == away_team) & (df["원정 팀"] == home_team)]
-
-    def get_avg_probs(data):
-        if data.empty:
-            return None
-        try:
-            odds = data[["홈 승 배당률", "무승부 배당률", "원정 승 배당률"]].to_numpy(dtype=float)
-            inverse_odds = 1 / odds  # (n, 3)
-            total_inverse = np.sum(inverse_odds, axis=1).reshape(-1, 1)  # (n, 1)
-            probs = inverse_odds / total_inverse  # 정규화된 확률 (n, 3)
-            avg_probs = np.mean(probs, axis=0)
-            return {
-                "home_win": avg_probs[0],
-                "draw": avg_probs[1],
-                "away_win": avg_probs[2]
-            }
-        except Exception as e:
-            return None
-
-    return get_avg_probs(data1), get_avg_probs(data2)
+    col1.metric("승", f"{record['승']}")
+    col2.metric("무", f"{record['무']}")
+    col3.metric("패", f"{record['패']}")
+
+    # 최근 폼 (모든 팀의 이동 합계를 한 번에 계산한 뒤 선택한 팀 구간만 표시)
+    st.subheader("최근 폼")
+    form_window = st.select_slider("최근 경기 수", options=FORM_WINDOWS, value=5)
+    team_matches = load_team_matches(all_seasons)
+    form = rolling_form(team_matches, form_window)
+    form_teams = [left_team] if right_team == "모두" else [left_team, right_team]
+    team_form = pd.concat([
+        form.iloc[team_form_rows(team_matches, index_team_id(scope_index, team))].assign(구단=team) for team in form_teams
+    ])
+    st.caption(f"각 경기 시점까지 최근 {form_window}경기 합계입니다. xPts는 배당률 확률로 본 기대 승점입니다.")
+
+    points_long = team_form.melt(
+        id_vars=["구단", "날짜"], value_vars=["최근 승점", "최근 xPts"], var_name="지표", value_name="값"
+    )
+    points_chart = alt.Chart(points_long).mark_line(point=True).encode(
+        x=alt.X("날짜:T", title="날짜"),
+        y=alt.Y("값:Q", title=f"최근 {form_window}경기 승점"),
+        color=alt.Color("구단:N", title="구단"),
+        strokeDash=alt.StrokeDash("지표:N", title="지표"),
+        tooltip=["날짜:T", "구단:N", "지표:N", alt.Tooltip("값:Q", format=".1f")],
+    )
+    st.altair_chart(points_chart, use_container_width=True)
+
+    goal_diff_chart = alt.Chart(team_form).mark_line(point=True).encode(
+        x=alt.X("날짜:T", title="날짜"),
+        y=alt.Y("최근 득실차:Q", title=f"최근 {form_window}경기 득실차"),
+        color=alt.Color("구단:N", title="구단"),
+        tooltip=["날짜:T", "구단:N", "최근 득실차:Q"],
+    )
+    st.altair_chart(goal_diff_chart, use_container_width=True)
+
+
+
 
 if menu == "승부 예측":
     st.header("승부 예측")
 
-    # 팀 선택 드롭다운
-    teams = sorted(df["홈 팀"].unique())[:20]  # 20개 구단
+    scope_arrays, scope_index, scope_probs, teams, all_seasons = select_scope("predict_scope")
 
     col1, col2, col3 = st.columns([4,1,4])  # 좌측, 가운데, 우측 비율 조정 가능
 
@@ -256,25 +441,27 @@ if menu == "승부 예측":
         right_teams = [team for team in teams if team != team1]
         team2 = st.selectbox("오른쪽 팀 선택", right_teams, index=len(right_teams) - 1)
 
+    predictor = st.radio("예측 모델", PREDICTORS, horizontal=True, key="predict_model")
+
     # 예측 설명
-    st.caption("각 팀이 홈일 때의 경기 결과를 따로 예측합니다. 예측은 배당률을 기반으로 계산됩니다.")
+    if predictor == "Elo 레이팅":
+        st.caption("각 팀이 홈일 때의 경기 결과를 따로 예측합니다. 예측은 시즌 순서대로 누적한 Elo 레이팅을 기반으로 계산됩니다.")
+    else:
+        st.caption("각 팀이 홈일 때의 경기 결과를 따로 예측합니다. 예측은 배당률을 기반으로 계산됩니다.")
 
 
     # --- 배당률 테이블 ---
     st.markdown("---")
     st.markdown("#### 배당률 데이터")
 
+    odds_cols = ["시즌"] if all_seasons else []
+    odds_cols += ["날짜", "홈 팀", "원정 팀", "홈 승 배당률", "무승부 배당률", "원정 승 배당률"]
+
     # team1 홈 경기 (vs team2)
-    team1_home_matches = df[
-        (df["홈 팀"] == team1) & (df["원정 팀"] == team2)
-    ][["날짜", "홈 팀", "원정 팀",
-       "홈 승 배당률", "무승부 배당률", "원정 승 배당률"]].copy()
+    team1_home_matches = arrays_to_frame(scope_arrays, pair_rows(scope_index, team1, team2))[odds_cols]
     
     # team2 홈 경기 (vs team1)
-    team2_home_matches = df[
-        (df["홈 팀"] == team2) & (df["원정 팀"] == team1)
-    ][["날짜", "홈 팀", "원정 팀",
-       "홈 승 배당률", "무승부 배당률", "원정 승 배당률"]].copy()
+    team2_home_matches = arrays_to_frame(scope_arrays, pair_rows(scope_index, team2, team1))[odds_cols]
     
 
     # 두 경기 기록 합치기
@@ -283,15 +470,16 @@ if menu == "승부 예측":
 
     # 출력
     st.dataframe(
-    match_history.set_index('날짜')[[
-        "홈 팀", "원정 팀", 
-        "홈 승 배당률", "무승부 배당률", "원정 승 배당률"
-    ]],
+    match_history.set_index('날짜')[[col for col in odds_cols if col != "날짜"]],
     use_container_width=True
 )
 
     # 확률 계산
-    home_first, home_second = calculate_win_probabilities(df, team1, team2)
+    if predictor == "Elo 레이팅":
+        rating_state = load_rating_state(all_seasons)
+        home_first, home_second = rating_win_probabilities(rating_state, team1, team2)
+    else:
+        home_first, home_second = calculate_win_probabilities(scope_index, scope_probs, team1, team2)
 
     col4, col5 = st.columns(2)
 
@@ -299,24 +487,61 @@ if menu == "승부 예측":
     with col4:
         st.markdown(f"### {team1} 홈")
 
-        st.write(f"- {team1} 승 확률: **{home_first['home_win'] * 100:.1f}%**")
-        st.write(f"- 무승부 확률: **{home_first['draw'] * 100:.1f}%**")
-        st.write(f"- {team2} 승 확률: **{home_first['away_win'] * 100:.1f}%**")
+        if home_first is None:
+            st.write("- 경기 기록이 없습니다.")
+        else:
+            st.write(f"- {team1} 승 확률: **{home_first['home_win'] * 100:.1f}%**")
+            st.write(f"- 무승부 확률: **{home_first['draw'] * 100:.1f}%**")
+            st.write(f"- {team2} 승 확률: **{home_first['away_win'] * 100:.1f}%**")
 
     # team2 홈일 때
     with col5:
         st.markdown(f"### {team2} 홈")
       
-        st.write(f"- {team2} 승 확률: **{home_second['home_win'] * 100:.1f}%**")
-        st.write(f"- 무승부 확률: **{home_second['draw'] * 100:.1f}%**")
-        st.write(f"- {team1} 승 확률: **{home_second['away_win'] * 100:.1f}%**")
+        if home_second is None:
+            st.write("- 경기 기록이 없습니다.")
+        else:
+            st.write(f"- {team2} 승 확률: **{home_second['home_win'] * 100:.1f}%**")
+            st.write(f"- 무승부 확률: **{home_second['draw'] * 100:.1f}%**")
+            st.write(f"- {team1} 승 확률: **{home_second['away_win'] * 100:.1f}%**")
         st.markdown("---")
+    # 전체 쌍의 확률 표 다운로드
+    with st.expander("전체 확률 표"):
+        prob_table = probability_table(scope_index, scope_probs)
+        st.dataframe(prob_table, use_container_width=True)
+        st.download_button(
+            "CSV 다운로드",
+            prob_table.to_csv(index=False).encode("utf-8-sig"),
+            file_name="win_probabilities.csv",
+            mime="text/csv",
+        )
+
+    # 경기 전 Elo 확률과 배당률 확률의 시즌별 로그 손실 비교 (낮을수록 정확)
+    with st.expander("예측 모델 비교"):
+        st.dataframe(
+            get_rating_backtest(season_sources()).style.format({"Elo 로그 손실": "{:.4f}", "배당률 로그 손실": "{:.4f}"}),
+            use_container_width=True,
+            hide_index=True,
+        )
+        if predictor == "Elo 레이팅":
+            st.dataframe(rating_table(rating_state).style.format({"레이팅": "{:.0f}"}), use_container_width=True, hide_index=True)
+
     st.markdown("#### 승리 확률 예측 알고리즘 안내")
-    st.markdown("""
+    if predictor == "Elo 레이팅":
+        st.markdown("""
+    Elo 예측은 경기 결과마다 **두 팀의 레이팅을 갱신**하고, 레이팅 차이로 기대 승점을 계산합니다.  
+    홈 팀에는 홈 어드밴티지가 더해지고, 전력이 비슷할수록 무승부 확률이 커집니다.
+    """)
+        st.latex(r"""
+    E_{\text{홈}} = \frac{1}{1 + 10^{-(R_{\text{홈}} + H - R_{\text{원정}})/400}}, \quad
+    R' = R + K (S - E)
+    """)
+    else:
+        st.markdown("""
     승리 확률 예측은 **배당률을 확률로 변환하는 공식**을 따릅니다.  
     각 결과의 확률은 다음 수식을 사용해 계산됩니다.
     """)
-    st.latex(r"""
+        st.latex(r"""
     \text{승리 확률} = \frac{1/\text{배당률}}{1/\text{홈 승 배당률} + 1/\text{무승부 배당률} + 1/\text{원정 승 배당률}}
     """)
 
@@ -326,63 +551,76 @@ if menu == "승부 예측":
 # 승부 예측 게임
 if menu == "승부 예측 게임":
 
-    def calculate_win_probabilities(df, team1, team2):
-        if not isinstance(team1, str) or not isinstance(team2, str):
-            return 0.5, 0.5, 2.0, 2.0
-        match = df[(df["홈 팀"] == team1) & (df["원정 팀"] == team2)]
-        if match.empty:
-            return 0.5, 0.5, 2.0, 2.0
-        try:
-            row = match.iloc[0]
-            home_odds = row["홈 승 배당률"]
-            away_odds = row["원정 승 배당률"]
-            p_home = (1 / home_odds) / ((1 / home_odds) + (1 / away_odds))
-            p_away = (1 / away_odds) / ((1 / home_odds) + (1 / away_odds))
-            return p_home, p_away, home_odds, away_odds
-        except:
-            return 0.5, 0.5, 2.0, 2.0
-
-    if "game_money" not in st.session_state:
-        st.session_state.game_money = 10000
-    if "round_matches" not in st.session_state:
+    game_predictor = st.radio("승리 확률 모델", PREDICTORS, horizontal=True, key="game_model")
+
+    # 토너먼트 전체를 여러 번 시뮬레이션해 라운드별 진출 확률 계산
+    with st.expander("토너먼트 시뮬레이션"):
+        n_sims = st.number_input("시뮬레이션 횟수", min_value=1000, max_value=10_000_000, value=100_000, step=10_000)
+        use_pool = st.checkbox("병렬 처리 (대규모 시뮬레이션용)")
+        if st.button("시뮬레이션 실행"):
+            bracket_teams = df_standings.head(16)["구단"].tolist()
+            bracket_ids = [index_team_id(season_index, team) for team in bracket_teams]
+            if game_predictor == "Elo 레이팅":
+                win_matrix = rating_win_matrix(load_rating_state(), bracket_teams)
+            else:
+                win_matrix = bracket_win_matrix(season_probs["probs"], season_probs["counts"], bracket_ids)
+            with st.spinner("시뮬레이션 중..."):
+                if use_pool:
+                    reach_counts = simulate_bracket_parallel(win_matrix, int(n_sims))
+                else:
+                    reach_counts = simulate_bracket(win_matrix, int(n_sims))
+            season_state["bracket_sim"] = bracket_probabilities(bracket_teams, reach_counts, int(n_sims))
+        if "bracket_sim" in season_state:
+            st.dataframe(
+                season_state["bracket_sim"].style.format({name: "{:.1%}" for name in ROUND_NAMES}),
+                use_container_width=True,
+                hide_index=True,
+            )
+
+    if "game_money" not in season_state:
+        season_state["game_money"] = 10000
+    if "round_matches" not in season_state:
         top16 = df_standings.head(16)
         teams = top16["구단"].tolist()
         random.shuffle(teams)
         matches = [(teams[i], teams[i+1]) for i in range(0, len(teams), 2)]
-        st.session_state.round_matches = matches
-        st.session_state.match_idx = 0
-        st.session_state.winners = []
-        st.session_state.show_result = False
-        st.session_state.bet_amount = 0
-        st.session_state.selected_team = None
-        st.session_state.result_handled = False
+        season_state["round_matches"] = matches
+        season_state["match_idx"] = 0
+        season_state["winners"] = []
+        season_state["show_result"] = False
+        season_state["bet_amount"] = 0
+        season_state["selected_team"] = None
+        season_state["result_handled"] = False
 
-    matches = st.session_state.round_matches
-    idx = st.session_state.match_idx
+    matches = season_state["round_matches"]
+    idx = season_state["match_idx"]
 
     team_count = len(matches) * 2
     round_name = {16: "16강", 8: "8강", 4: "4강", 2: "결승"}.get(team_count, f"{team_count}강")
 
 
     if idx >= len(matches):
-        winners = st.session_state.winners
+        winners = season_state["winners"]
         if len(winners) == 1:
             st.subheader(f"최종 우승팀: {winners[0]} 🎉축하합니다!🎉")
             st.stop()
         random.shuffle(winners)
         next_matches = [(winners[i], winners[i+1]) for i in range(0, len(winners), 2)]
-        st.session_state.round_matches = next_matches
-        st.session_state.match_idx = 0
-        st.session_state.winners = []
-        st.session_state.show_result = False
-        st.session_state.bet_amount = 0
-        st.session_state.selected_team = None
-        st.session_state.result_handled = False
+        season_state["round_matches"] = next_matches
+        season_state["match_idx"] = 0
+        season_state["winners"] = []
+        season_state["show_result"] = False
+        season_state["bet_amount"] = 0
+        season_state["selected_team"] = None
+        season_state["result_handled"] = False
         matches = next_matches
         idx = 0
 
     home_team, away_team = matches[idx]
-    p_home, p_away, home_odds, away_odds = calculate_win_probabilities(df, home_team, away_team)
+    p_home, p_away, home_odds, away_odds = calculate_game_probabilities(season_arrays, season_index, season_probs, home_team, away_team)
+    if game_predictor == "Elo 레이팅":
+        # 배당은 그대로 두고 경기 결과만 레이팅 확률로 결정
+        p_home, p_away = rating_game_probabilities(load_rating_state(), home_team, away_team)
 
     st.header("승부 예측 토너먼트")
     st.subheader(f"{round_name} 전체 경기 매치업")
@@ -391,46 +629,62 @@ if menu == "승부 예측 게임":
     for i, (home, away) in enumerate(matches, 1):
         st.markdown(f"- 경기 {i}: **{home} (홈)** vs **{away} (원정)**")
 
-    st.markdown(f"현재 게임 머니: {st.session_state.game_money}원")
+    st.markdown(f"현재 게임 머니: {season_state['game_money']}원")
     st.subheader(f"{round_name} - 경기 {idx + 1} / {len(matches)}")
     st.markdown(f"경기장: **{home_team} 홈구장**")
     st.markdown(f"**{home_team} (홈) vs {away_team} (원정)**")
     st.markdown(f"배당률: {home_team} - {home_odds}, {away_team} - {away_odds}")
     st.markdown(f"승리 확률: {home_team} - {p_home:.2%}, {away_team} - {p_away:.2%}")
 
-    if not st.session_state.show_result:
+    if not season_state["show_result"]:
         with st.form("bet_form"):
-            bet_amount = st.number_input("배팅 금액 입력", min_value=1, max_value=st.session_state.game_money, step=100)
+            bet_amount = st.number_input("배팅 금액 입력", min_value=1, max_value=season_state["game_money"], step=100)
             selected_team = st.radio("이길 팀 선택", options=[home_team, away_team])
             submitted = st.form_submit_button("확인")
             if submitted:
-                if bet_amount <= 0 or bet_amount > st.session_state.game_money:
+                if bet_amount <= 0 or bet_amount > season_state["game_money"]:
                     st.warning("배팅 금액을 올바르게 입력하세요.")
                 else:
-                    st.session_state.bet_amount = bet_amount
-                    st.session_state.selected_team = selected_team
+                    season_state["bet_amount"] = bet_amount
+                    season_state["selected_team"] = selected_team
                     winner = np.random.choice([home_team, away_team], p=[p_home, p_away])
-                    st.session_state.winner = winner
-                    st.session_state.show_result = True
-                    st.session_state.result_handled = False
+                    season_state["winner"] = winner
+                    season_state["show_result"] = True
+                    season_state["result_handled"] = False
     else:
-        winner = st.session_state.winner
+        winner = season_state["winner"]
         st.markdown(f"🎉 경기 결과: **{winner} 승리!**")
 
-        if not st.session_state.result_handled:
-            if winner == st.session_state.selected_team:
-                win_money = int(st.session_state.bet_amount * (home_odds if winner == home_team else away_odds))
+        if not season_state["result_handled"]:
+            if winner == season_state["selected_team"]:
+                win_money = int(season_state["bet_amount"] * (home_odds if winner == home_team else away_odds))
                 st.markdown(f"축하합니다! 배팅 성공! +{win_money}원 획득")
-                st.session_state.game_money += win_money
+                season_state["game_money"] += win_money
             else:
-                st.markdown(f"배팅 실패.. -{st.session_state.bet_amount}원 손실")
-                st.session_state.game_money -= st.session_state.bet_amount
-            st.session_state.result_handled = True
+                st.markdown(f"배팅 실패.. -{season_state['bet_amount']}원 손실")
+                season_state["game_money"] -= season_state["bet_amount"]
+            season_state["result_handled"] = True
 
         if st.button("다음 경기"):
-            st.session_state.winners.append(winner)
-            st.session_state.match_idx += 1
-            st.session_state.show_result = False
-            st.session_state.result_handled = False
-            st.session_state.bet_amount = 0
-            st.session_state.selected_team = None
+            season_state["winners"].append(winner)
+            season_state["match_idx"] += 1
+            season_state["show_result"] = False
+            season_state["result_handled"] = False
+            season_state["bet_amount"] = 0
+            season_state["selected_team"] = None
+
+# 재실행 성능 측정 결과 (사이드바 패널 + JSONL 로그)
+profiling.checkpoint(f"페이지: {menu}")
+profile = profiling.summary(season=selected_season, menu=menu)
+if profile is not None:
+    profiling.append_log(profile, PROFILE_LOG)
+    with st.sidebar.expander(f"재실행 성능 ({profile['total_ms']:.1f} ms)", expanded=True):
+        st.dataframe(
+            pd.DataFrame({"단계": list(profile["stages_ms"]), "시간 (ms)": list(profile["stages_ms"].values())}),
+            hide_index=True,
+            use_container_width=True,
+        )
+        if profile["cache"]:
+            cache_stats = pd.DataFrame.from_dict(profile["cache"], orient="index")
+            cache_stats.index.name = "캐시"
+            st.dataframe(cache_stats, use_container_width=True)
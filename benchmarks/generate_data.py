@@ -0,0 +1,80 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+# 앱의 시즌 CSV와 같은 컬럼 구성
+COLUMNS = ["날짜", "홈 팀", "원정 팀", "홈 팀 득점", "원정 팀 득점", "경기 결과", "홈 승 배당률", "무승부 배당률", "원정 승 배당률"]
+
+# 배당률에 포함되는 북메이커 마진, 무승부 기본 확률
+MARGIN = 1.05
+DRAW_RATE = 0.26
+
+
+def team_names(n_teams):
+    return np.array([f"구단 {i:04d} FC" for i in range(n_teams)], dtype=object)
+
+
+# 한 시즌 (모든 팀이 홈/원정으로 한 번씩 맞붙는 더블 라운드 로빈) 생성
+def generate_season(names, start_year, rng):
+    n_teams = len(names)
+    strength = rng.normal(0, 0.35, n_teams)
+    home, away = np.nonzero(~np.eye(n_teams, dtype=bool))
+
+    # 8월 10일부터 약 280일에 걸쳐 경기 배치
+    days = np.sort(rng.integers(0, 283, len(home)))
+    order = rng.permutation(len(home))
+    home, away = home[order], away[order]
+    dates = pd.Timestamp(year=start_year, month=8, day=10) + pd.to_timedelta(days, unit="D")
+
+    # 전력 차이로 득점과 배당률 생성
+    diff = strength[home] - strength[away] + 0.25
+    home_goals = rng.poisson(np.exp(0.3 + diff / 2))
+    away_goals = rng.poisson(np.exp(0.1 - diff / 2))
+    result = np.where(home_goals > away_goals, "H", np.where(home_goals < away_goals, "A", "D"))
+
+    p_home = (1 - DRAW_RATE) / (1 + np.exp(-1.6 * diff))
+    p_away = 1 - DRAW_RATE - p_home
+    odds = np.column_stack([p_home, np.full(len(home), DRAW_RATE), p_away])
+    odds = np.maximum(np.round(1 / (odds * MARGIN), 2), 1.01)
+
+    return pd.DataFrame({
+        "날짜": dates.strftime("%Y/%m/%d"),
+        "홈 팀": names[home],
+        "원정 팀": names[away],
+        "홈 팀 득점": home_goals,
+        "원정 팀 득점": away_goals,
+        "경기 결과": result,
+        "홈 승 배당률": odds[:, 0],
+        "무승부 배당률": odds[:, 1],
+        "원정 승 배당률": odds[:, 2],
+    })[COLUMNS]
+
+
+# 시즌 파일 여러 개 생성 후 경로 목록 반환
+def generate(out_dir, n_teams=20, n_seasons=5, first_year=2000, seed=0):
+    os.makedirs(out_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    names = team_names(n_teams)
+    paths = []
+    for start_year in range(first_year, first_year + n_seasons):
+        path = os.path.join(out_dir, f"synthetic_{start_year}_{start_year + 1}.csv")
+        generate_season(names, start_year, rng).to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크용 합성 시즌 CSV 생성")
+    parser.add_argument("-o", "--out-dir", default="benchmarks/data", help="출력 디렉터리")
+    parser.add_argument("-t", "--teams", type=int, default=200, help="리그 팀 수")
+    parser.add_argument("-s", "--seasons", type=int, default=10, help="시즌 수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    for path in generate(args.out_dir, args.teams, args.seasons, seed=args.seed):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+MENUS = ["전체 분석", "팀별 분석", "승부 예측", "승부 예측 게임"]
+
+# AppTest는 실행 중에 전역 Runtime/설정을 바꾸므로 재실행은 한 번에 하나씩만 가능
+# 사용자 스레드는 동시에 요청하고 차례를 기다림 → 대기 포함 지연 시간이 동시 접속 시 체감 지연
+# (한 서버 프로세스에서 GIL을 나눠 쓰는 상황과 같이 CPU 작업이 직렬화됨)
+RUN_LOCK = threading.Lock()
+
+
+# 현재/최대 RSS (MiB, 현재 값은 /proc이 있는 리눅스에서만)
+def memory_mib():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    if sys.platform == "darwin":
+        peak /= 1024  # macOS는 바이트 단위
+    try:
+        with open("/proc/self/statm") as f:
+            current = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError):
+        current = None
+    return current, peak
+
+
+# 사용자가 할 수 있는 조작 중 현재 화면에 있는 것만 골라 무작위로 하나 실행
+def random_action(at, rng):
+    actions = [("메뉴", lambda: [s for s in at.selectbox if s.options == MENUS][0])]
+    actions.append(("시즌", lambda: [s for s in at.sidebar.selectbox if s.label == "시즌 선택"][0]))
+    if any(r.label == "분석 범위" for r in at.radio):
+        actions.append(("분석 범위", lambda: [r for r in at.radio if r.label == "분석 범위"][0]))
+    if len(at.select_slider):
+        actions.append(("슬라이더", lambda: at.select_slider[0]))
+
+    name, find = rng.choice(actions)
+    widget = find()
+    widget.set_value(rng.choice(list(widget.options)))
+    return name
+
+
+# 사용자 한 명: 첫 접속 후 조작 n_actions번, 재실행마다 (조작, 대기 포함 지연, 실행 시간) 기록
+def run_user(user_id, n_actions, seed, timeout, barrier):
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed + user_id)
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    barrier.wait()  # 모든 사용자가 동시에 접속
+    timings = []
+
+    action = "첫 접속"
+    for step in range(n_actions + 1):
+        if step:
+            action = random_action(at, rng)
+        requested = time.perf_counter()
+        with RUN_LOCK:
+            started = time.perf_counter()
+            at.run()
+        finished = time.perf_counter()
+        timings.append((action, finished - requested, finished - started))
+        if at.exception:
+            raise RuntimeError(f"사용자 {user_id} ({action}): {at.exception[0].value}")
+    return timings
+
+
+def percentiles(values):
+    values = np.asarray(values) * 1000
+    return {
+        "count": len(values),
+        "p50": float(np.percentile(values, 50)),
+        "p90": float(np.percentile(values, 90)),
+        "p99": float(np.percentile(values, 99)),
+        "max": float(values.max()),
+    }
+
+
+def print_row(name, stats):
+    print(
+        f"{name:<12} {stats['count']:6d}  p50 {stats['p50']:9.1f} ms  p90 {stats['p90']:9.1f} ms  "
+        f"p99 {stats['p99']:9.1f} ms  max {stats['max']:9.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="여러 세션이 동시에 앱을 사용할 때의 재실행 지연 시간/메모리 측정")
+    parser.add_argument("-u", "--users", type=int, default=20, help="동시 사용자 수")
+    parser.add_argument("-n", "--actions", type=int, default=10, help="사용자별 조작 횟수")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="조작 순서 난수 시드")
+    parser.add_argument("--timeout", type=float, default=120, help="재실행 한 번의 제한 시간(초)")
+    parser.add_argument("--cold", action="store_true", help="준비 실행 없이 빈 캐시에서 동시에 시작")
+    parser.add_argument("-o", "--output", help="결과를 추가할 JSONL 파일")
+    args = parser.parse_args()
+
+    # 앱은 시즌 CSV를 상대 경로로 읽음
+    os.chdir(ROOT)
+    memory_before = memory_mib()
+
+    # --cold가 아니면 준비 실행으로 첫 화면 데이터를 캐시에 올려 둠
+    if not args.cold:
+        from streamlit.testing.v1 import AppTest
+
+        AppTest.from_file(APP_PATH, default_timeout=args.timeout).run()
+    barrier = threading.Barrier(args.users)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.users) as executor:
+        futures = [
+            executor.submit(run_user, user_id, args.actions, args.seed, args.timeout, barrier)
+            for user_id in range(args.users)
+        ]
+        timings = [timing for future in futures for timing in future.result()]
+    elapsed = time.perf_counter() - started
+    memory_after = memory_mib()
+
+    by_action = {}
+    for action, latency, _ in timings:
+        by_action.setdefault(action, []).append(latency)
+    results = {"전체": percentiles([latency for _, latency, _ in timings])}
+    results.update({action: percentiles(values) for action, values in by_action.items()})
+    service = percentiles([seconds for _, _, seconds in timings])
+
+    print(f"사용자 {args.users}명 × 조작 {args.actions}회, {elapsed:.1f}초 ({len(timings) / elapsed:.1f} 재실행/초)")
+    print("대기 포함 지연 시간")
+    for name, stats in results.items():
+        print_row(name, stats)
+    print("재실행 자체 시간")
+    print_row("전체", service)
+    current_before, _ = memory_before
+    current_after, peak_after = memory_after
+    if current_after is not None:
+        print(f"RSS {current_before:.1f} MiB → {current_after:.1f} MiB (최대 {peak_after:.1f} MiB)")
+    else:
+        print(f"최대 RSS {peak_after:.1f} MiB")
+
+    if args.output:
+        record = {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "params": {"users": args.users, "actions": args.actions, "seed": args.seed, "cold": args.cold},
+            "elapsed": elapsed,
+            "rss_mib": {"before": current_before, "after": current_after, "peak": peak_after},
+            "results": results,
+            "service": service,
+        }
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
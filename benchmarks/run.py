@@ -0,0 +1,223 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from epl_analytics import (  # noqa: E402
+    append_live_rows, arrays_to_frame, build_match_index, build_match_store, build_probability_matrix,
+    build_standings_cube, build_team_matches, calculate_game_probabilities, calculate_standings, calculate_win_probabilities,
+    format_match_row, format_match_rows, head_to_head_rows, load_match_arrays, load_season, match_arrays_nbytes,
+    match_index_from_arrays, new_rating_state, open_live_season, pack_matches, probability_matrix_from_arrays,
+    read_season_csv, save_match_arrays, standings_from_arrays, team_rows, update_ratings,
+)
+from benchmarks.generate_data import generate  # noqa: E402
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results.jsonl")
+
+
+# repeat번 실행해 최소/중앙값 시간(초) 기록
+def measure(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return {"min": min(timings), "median": float(np.median(timings)), "repeat": repeat}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# 앱의 주요 경로별 벤치마크 (한 시즌 기준 + 전체 시즌 통합)
+# 실시간 시즌 상태의 팀 번호가 인덱스/누적 순위/압축 배열/팀-경기 테이블에서 모두 같은지 확인
+def check_live_team_codes(state):
+    teams = list(state["index"]["teams"])
+    names = np.array(teams, dtype=object)
+    home_names = state["df"]["홈 팀"].astype(str).to_numpy(dtype=object)
+    away_names = state["df"]["원정 팀"].astype(str).to_numpy(dtype=object)
+    arrays = pack_matches(state["df"], tuple(teams))
+    team_matches = build_team_matches(state["df"])
+    rows = team_matches["경기 행"].to_numpy()
+    expected = np.where(team_matches["장소"] == "홈", home_names[rows], away_names[rows])
+    if (
+        list(state["cube"][1]) != teams
+        or list(arrays["teams"]) != teams
+        or not (names[arrays["home"]] == home_names).all()
+        or not (names[arrays["away"]] == away_names).all()
+        or not (names[team_matches["구단 ID"].to_numpy()] == expected).all()
+    ):
+        raise RuntimeError("실시간 시즌의 팀 번호가 인덱스/누적 순위/압축 배열/팀-경기 테이블 사이에 다릅니다")
+
+
+def run_benchmarks(paths, repeat=5, sample=50, seed=0):
+    rng = np.random.default_rng(seed)
+    results = {}
+
+    def bench(name, fn):
+        results[name] = measure(fn, repeat)
+        print(f"{name:<32} min {results[name]['min'] * 1000:10.2f} ms  median {results[name]['median'] * 1000:10.2f} ms")
+
+    path = paths[-1]
+    bench("load.read_csv", lambda: read_season_csv(path))
+    load_season(path)  # parquet 캐시 생성
+    bench("load.parquet_cache", lambda: load_season(path))
+
+    df = load_season(path)
+    bench("standings.calculate", lambda: calculate_standings(df))
+    bench("standings.cube", lambda: build_standings_cube(df))
+    bench("index.build", lambda: build_match_index(df))
+    index = build_match_index(df)
+    bench("probabilities.matrix", lambda: build_probability_matrix(df, index))
+    matrix = build_probability_matrix(df, index)
+
+    teams = index["teams"]
+    pairs = [tuple(teams[rng.choice(len(teams), 2, replace=False)]) for _ in range(sample)]
+    bench("probabilities.win_lookup", lambda: [calculate_win_probabilities(index, matrix, a, b) for a, b in pairs])
+    season_arrays = pack_matches(df)
+    bench("probabilities.game_lookup", lambda: [calculate_game_probabilities(season_arrays, index, matrix, a, b) for a, b in pairs])
+
+    # 팀별 분석: 팀 전체 경기 / 상대 전적 필터링 후 날짜 내림차순 정렬
+    bench("team.filter_sort_all", lambda: [
+        df.iloc[team_rows(index, a)].sort_values(by="날짜", ascending=False) for a, _ in pairs
+    ])
+    bench("team.filter_sort_h2h", lambda: [
+        df.iloc[head_to_head_rows(index, a, b)].sort_values(by="날짜", ascending=False) for a, b in pairs
+    ])
+
+    team_data = df.iloc[team_rows(index, pairs[0][0])].sort_values(by="날짜", ascending=False)
+    bench("team.format_match_rows", lambda: [
+        format_match_row(row.날짜.strftime("%Y-%m-%d"), row[2], row[4], row[5], row[3], pairs[0][0])
+        for row in team_data.itertuples()
+    ])
+    bench("team.format_match_rows_batch", lambda: format_match_rows(team_data, pairs[0][0]))
+
+    # 전체 시즌 통합 데이터
+    frames = [(os.path.basename(p), load_season(p)) for p in paths]
+    bench("store.build", lambda: build_match_store(frames))
+    store, store_teams = build_match_store(frames)
+    bench("store.index_build", lambda: build_match_index(store))
+    bench("store.standings", lambda: calculate_standings(store))
+
+    # 압축 배열: 변환 / 메모리 맵 열기 / 배열에서 바로 순위표·인덱스·확률 행렬 계산 / 한 팀 경기만 표시용 DataFrame으로
+    bench("columnar.pack", lambda: pack_matches(store, tuple(store_teams)))
+    arrays = pack_matches(store, tuple(store_teams))
+    with tempfile.TemporaryDirectory() as pack_dir:
+        save_match_arrays(arrays, pack_dir)
+        bench("columnar.load_mmap", lambda: load_match_arrays(pack_dir))
+        mapped = load_match_arrays(pack_dir)
+        bench("columnar.standings", lambda: standings_from_arrays(mapped))
+        bench("columnar.index", lambda: match_index_from_arrays(mapped))
+        bench("columnar.probabilities", lambda: probability_matrix_from_arrays(mapped))
+        mapped_index = match_index_from_arrays(mapped)
+        bench("columnar.team_frame", lambda: arrays_to_frame(mapped, team_rows(mapped_index, mapped["teams"][0])))
+        del mapped_index
+        del mapped
+    print(
+        f"{'memory.store_frame':<32} {store.memory_usage(deep=True).sum() / 1024:10.1f} KiB  "
+        f"columnar {match_arrays_nbytes(arrays) / 1024:10.1f} KiB"
+    )
+
+    # Elo 레이팅: 전체 시즌 재계산 / 직전 체크포인트에 마지막 10경기만 추가
+    def replay_ratings(season_frames):
+        state = new_rating_state()
+        for season, season_df in season_frames:
+            state, _ = update_ratings(state, season_df, season)
+        return state
+
+    bench("ratings.replay", lambda: replay_ratings(frames))
+    last_season, last_df = frames[-1]
+    checkpoint = update_ratings(replay_ratings(frames[:-1]), last_df.iloc[:-10], last_season)[0]
+    bench("ratings.append", lambda: update_ratings(checkpoint, last_df, last_season))
+
+    # 실시간 추가: 마지막 10경기를 이어 붙여 파생 테이블 갱신 / 파일 전체를 다시 읽고 계산
+    with tempfile.TemporaryDirectory() as live_dir:
+        live_path = os.path.join(live_dir, os.path.basename(path))
+        df.iloc[:-10].to_csv(live_path, index=False, date_format="%Y/%m/%d")
+        head_state = open_live_season(live_path)
+    bench("live.append_rows", lambda: append_live_rows(head_state, df.iloc[-10:]))
+    bench("live.reopen", lambda: open_live_season(path))
+
+    # 첫 라운드만 열고 나머지를 이어 붙여도 팀 번호는 처음 열 때의 순서를 유지
+    first_round = len(build_match_index(df)["teams"]) // 2
+    with tempfile.TemporaryDirectory() as live_dir:
+        live_path = os.path.join(live_dir, os.path.basename(path))
+        df.iloc[:first_round].to_csv(live_path, index=False, date_format="%Y/%m/%d")
+        check_live_team_codes(append_live_rows(open_live_season(live_path), df.iloc[first_round:]))
+    return results, len(df), len(store)
+
+
+# 같은 조건으로 측정한 직전 결과와 비교
+def compare(previous, results):
+    print(f"\n직전 결과 ({previous['timestamp']}, {previous['git_commit']}) 대비 중앙값 비율")
+    for name, result in results.items():
+        if name in previous["results"]:
+            ratio = result["median"] / previous["results"][name]["median"]
+            flag = "  <-- 느려짐" if ratio > 1.2 else ""
+            print(f"{name:<32} {ratio:6.2f}x{flag}")
+
+
+def load_previous(output, params):
+    if not os.path.exists(output):
+        return None
+    with open(output, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    matching = [record for record in records if record["params"] == params]
+    return matching[-1] if matching else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EPL 분석 앱 주요 경로 벤치마크")
+    parser.add_argument("--data-dir", help="시즌 CSV 디렉터리 (없으면 합성 데이터를 생성)")
+    parser.add_argument("-t", "--teams", type=int, default=200, help="합성 데이터 팀 수")
+    parser.add_argument("-s", "--seasons", type=int, default=5, help="합성 데이터 시즌 수")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="측정 반복 횟수")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help="결과를 추가할 JSONL 파일")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.data_dir:
+            paths = sorted(
+                os.path.join(args.data_dir, name) for name in os.listdir(args.data_dir) if name.endswith(".csv")
+            )
+            params = {"data_dir": os.path.abspath(args.data_dir)}
+        else:
+            paths = generate(tmp_dir, args.teams, args.seasons)
+            params = {"teams": args.teams, "seasons": args.seasons}
+
+        results, season_rows, store_rows = run_benchmarks(paths, args.repeat)
+
+    params.update({"season_rows": season_rows, "store_rows": store_rows})
+    previous = load_previous(args.output, params)
+    record = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "params": params,
+        "results": results,
+    }
+    with open(args.output, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    if previous:
+        compare(previous, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import io
+import os
+
+# 한글 폰트 (파일이 없으면 matplotlib 기본 폰트 사용)
+FONT_PATH = "fonts/NanumGothic.ttf"
+
+# 전체 분석 막대 그래프: (버튼 이름, 순위표 컬럼, 색상)
+BAR_CHARTS = [
+    ("득점 그래프 보기", "득점", None),
+    ("승점 그래프 보기", "승점", "orange"),
+    ("승리 횟수 그래프 보기", "승", "green"),
+]
+
+_font_prop = None
+
+
+# matplotlib은 그래프를 실제로 그릴 때 처음 import
+def chart_font():
+    global _font_prop
+    if _font_prop is None and os.path.exists(FONT_PATH):
+        from matplotlib.font_manager import FontProperties
+        _font_prop = FontProperties(fname=FONT_PATH)
+    return _font_prop
+
+
+# 구단별 막대 그래프를 PNG 바이트로 렌더링 (pyplot 전역 상태를 쓰지 않아 세션 간 안전)
+def render_bar_chart(labels, values, color=None):
+    from matplotlib import rc_context
+    from matplotlib.figure import Figure
+
+    font_prop = chart_font()
+    with rc_context({"axes.unicode_minus": False}):
+        fig = Figure()
+        ax = fig.subplots()
+        ax.bar(range(len(labels)), values, color=color)
+        ax.set_xticks(range(len(labels)))
+        ax.set_xticklabels(labels, rotation=90, fontproperties=font_prop)
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", bbox_inches="tight")
+    return buf.getvalue()
@@ -1,17 +1,19 @@
-import pandas as pd
+import argparse
+import glob
+import hashlib
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 
-# CSV 파일 읽기
-df = pd.read_csv('E0.csv')
+import numpy as np
+import pandas as pd
 
 # 필요한 컬럼만 선택
 cols_to_keep = ['Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG', 'FTR', 'B365H', 'B365D', 'B365A']
-df_filtered = df[cols_to_keep]
-
-# 날짜를 datetime 타입으로 변환 (일/월/연도 형식) 후 '연/월/일' 문자열로 변경
-df_filtered['Date'] = pd.to_datetime(df_filtered['Date'], dayfirst=True).dt.strftime('%Y/%m/%d')
 
 # 컬럼명 한글로 변경
-df_filtered = df_filtered.rename(columns={
+column_names = {
     'Date': '날짜',
     'HomeTeam': '홈 팀',
     'AwayTeam': '원정 팀',
@@ -21,7 +23,7 @@ df_filtered = df_filtered.rename(columns={
     'B365H': '홈 승 배당률',
     'B365D': '무승부 배당률',
     'B365A': '원정 승 배당률'
-})
+}
 
 # 팀명 딕셔너리 (csv에 있는 이름 그대로 유지 + 강등팀 포함)
 team_dict = {
@@ -60,10 +62,214 @@ team_dict = {
 
 }
 
-# 팀명 변환 적용
-df_filtered['홈 팀'] = df_filtered['홈 팀'].replace(team_dict)
-df_filtered['원정 팀'] = df_filtered['원정 팀'].replace(team_dict)
+# 리그 코드별 출력 파일 접두어 (그 외 리그는 코드를 소문자로 사용)
+division_prefixes = {'E0': 'epl'}
+
+# 입력 파일 해시 기록 (변경되지 않은 파일은 다시 처리하지 않음)
+MANIFEST_NAME = '.csveditor_manifest.json'
+
+
+# 팀명 변환: 고유 이름만 딕셔너리에서 찾고 코드로 펼침, 없는 이름은 원래 이름 유지
+def map_team_names(series):
+    codes, uniques = pd.factorize(series)
+    mapped = np.array([team_dict.get(name, name) for name in uniques], dtype=object)
+    unmapped = sorted(name for name in uniques if name not in team_dict)
+    return pd.Series(mapped[codes], index=series.index), unmapped
+
+
+# 시즌 시작 연도 (7월 이후 경기는 그 해, 이전 경기는 전년도 시즌)
+def season_start_year(dates):
+    return np.where(dates.dt.month >= 7, dates.dt.year, dates.dt.year - 1)
+
+
+def output_name(division, start_year):
+    prefix = division_prefixes.get(division, str(division).lower())
+    return f'{prefix}_{start_year % 100:02d}_{(start_year + 1) % 100:02d}.csv'
+
+
+# 경기 행만 남기고 리그 코드, 날짜(일/월/연도 형식 → datetime)를 구함
+def match_keys(df, default_division):
+    df = df.dropna(subset=['Date', 'HomeTeam', 'AwayTeam'])
+    divisions = df['Div'] if 'Div' in df.columns else pd.Series(default_division, index=df.index)
+    dates = pd.to_datetime(df['Date'], dayfirst=True, format='mixed')
+    return df, divisions, dates
+
+
+# football-data 원본을 앱에서 쓰는 한글 컬럼 형식으로 변환
+# 반환값: 리그/시즌별 출력 파일 이름 → DataFrame, 매핑되지 않은 팀명 목록
+def normalize_matches(df, default_division='E0'):
+    df, divisions, dates = match_keys(df, default_division)
+    df_filtered = df[cols_to_keep].copy()
+
+    # 날짜를 '연/월/일' 문자열로 변경
+    df_filtered['Date'] = dates.dt.strftime('%Y/%m/%d')
+    df_filtered = df_filtered.rename(columns=column_names)
+
+    df_filtered['홈 팀'], unmapped_home = map_team_names(df_filtered['홈 팀'])
+    df_filtered['원정 팀'], unmapped_away = map_team_names(df_filtered['원정 팀'])
+    unmapped = sorted(set(unmapped_home) | set(unmapped_away))
+
+    outputs = {}
+    for (division, start_year), group in df_filtered.groupby([divisions, season_start_year(dates)], sort=True):
+        outputs[output_name(division, int(start_year))] = group
+    return outputs, unmapped
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# 원본에서 필요한 컬럼만 읽음 (chunksize를 주면 고정 크기 청크로 나눠 읽음)
+def read_matches(path, chunksize=None, columns=cols_to_keep):
+    wanted = set(columns) | {'Div'}
+    reader = pd.read_csv(path, usecols=lambda col: col in wanted, encoding_errors='replace', chunksize=chunksize)
+    return reader if chunksize else [reader]
+
+
+def default_division(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+# 입력 파일이 만들 출력 파일 이름만 미리 구함 (날짜/리그/팀 컬럼만 읽음)
+def scan_outputs(path, chunksize=None):
+    names = set()
+    for chunk in read_matches(path, chunksize, columns=['Date', 'HomeTeam', 'AwayTeam']):
+        _, divisions, dates = match_keys(chunk, default_division(path))
+        keys = pd.DataFrame({'division': divisions, 'start_year': season_start_year(dates)}).drop_duplicates()
+        names.update(output_name(division, int(start_year)) for division, start_year in keys.itertuples(index=False))
+    return sorted(names)
+
+
+# 출력 파일을 공유하는 입력끼리 묶음 (입력 순서 유지)
+# 한 묶음은 작업자 하나가 처리하므로 여러 입력이 같은 출력 파일을 서로 덮어쓰지 않음
+def group_inputs(planned):
+    groups, owner = {}, {}
+    for key, (path, outputs) in enumerate(planned.items()):
+        merged = sorted({owner[name] for name in outputs if name in owner})
+        groups[key] = [member for gid in merged for member in groups.pop(gid)] + [path]
+        for member in groups[key]:
+            for name in planned[member]:
+                owner[name] = key
+    return list(groups.values())
+
+
+# 입력 묶음 하나 처리 (프로세스 풀에서 실행)
+# 청크마다 변환해 출력 파일에 이어 쓰므로 메모리 사용량은 청크 크기로 제한됨
+# 여러 입력이 같이 쓰는 출력 파일(shared)만 이미 쓴 경기(날짜, 홈 팀, 원정 팀)를 기억해 다시 쓰지 않음 → 먼저 처리한 입력이 우선
+def process_group(paths, out_dir, chunksize=None, shared=()):
+    written, seen, results = set(), {name: set() for name in shared}, {}
+    for path in paths:
+        outputs_of_path, unmapped, duplicates = set(), set(), 0
+        for chunk in read_matches(path, chunksize):
+            outputs, chunk_unmapped = normalize_matches(chunk, default_division(path))
+            unmapped.update(chunk_unmapped)
+            for name, season_df in outputs.items():
+                if name in seen:
+                    keys = season_df['날짜'] + '|' + season_df['홈 팀'] + '|' + season_df['원정 팀']
+                    fresh = ~keys.isin(seen[name]) & ~keys.duplicated()
+                    seen[name].update(keys[fresh])
+                    duplicates += int((~fresh).sum())
+                    season_df = season_df[fresh]
+                # 결과 CSV로 저장 (index 제외, 이번 실행에서 처음 쓰는 파일만 헤더 포함)
+                first = name not in written
+                season_df.to_csv(os.path.join(out_dir, name), mode='w' if first else 'a', header=first, index=False)
+                written.add(name)
+                outputs_of_path.add(name)
+        results[path] = (sorted(outputs_of_path), sorted(unmapped), duplicates)
+    return results
+
+
+def load_manifest(out_dir):
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(out_dir, manifest):
+    with open(os.path.join(out_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+def expand_inputs(inputs):
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(sorted(glob.glob(os.path.join(item, '*.csv'))))
+        else:
+            paths.extend(sorted(glob.glob(item)) or [item])
+    return paths
+
+
+def run_batch(inputs, out_dir='.', workers=None, force=False, chunksize=None):
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = load_manifest(out_dir)
+
+    # 입력별 출력 파일: 내용 해시가 같으면 기록된 목록, 아니면 원본을 훑어서 구함
+    # 입력이 하나뿐이고 같이 묶일 이전 입력도 없으면 묶을 필요가 없으므로 훑지 않음 (출력 목록은 처리하면서 기록)
+    paths = expand_inputs(inputs)
+    needs_scan = len(paths) > 1 or any(path not in paths and os.path.exists(path) for path in manifest)
+    digests, planned = {}, {}
+    for path in paths:
+        digests[path] = file_digest(path)
+        entry = manifest.get(path)
+        unchanged = entry and entry['sha256'] == digests[path]
+        planned[path] = entry['outputs'] if unchanged else scan_outputs(path, chunksize) if needs_scan else []
+
+    # 이전 실행에서 같은 출력 파일에 쓴 입력도 묶음에 넣음 (출력 파일을 다시 쓸 때 그 경기도 포함)
+    planned_outputs = {name for outputs in planned.values() for name in outputs}
+    for path, entry in manifest.items():
+        if path not in planned and os.path.exists(path) and planned_outputs & set(entry['outputs']):
+            digests[path] = file_digest(path)
+            planned[path] = entry['outputs']
+
+    # 묶음 안의 입력이 하나라도 바뀌었거나 출력 파일이 없으면 묶음 전체를 다시 처리
+    pending = []
+    for group in group_inputs(planned):
+        dirty = force or any(
+            manifest.get(path, {}).get('sha256') != digests[path]
+            or not all(os.path.exists(os.path.join(out_dir, name)) for name in planned[path])
+            for path in group
+        )
+        if not dirty:
+            for path in group:
+                print(f'[skip] {path} (변경 없음)')
+            continue
+        if len(group) > 1:
+            print(f'[group] {", ".join(group)} (출력 파일 공유, 한 작업자가 순서대로 처리)')
+        counts = Counter(name for path in group for name in planned[path])
+        pending.append((group, {name for name, count in counts.items() if count > 1}))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(process_group, group, out_dir, chunksize, shared) for group, shared in pending]
+        for future in futures:
+            for path, (outputs, unmapped, duplicates) in future.result().items():
+                manifest[path] = {'sha256': digests[path], 'outputs': outputs, 'unmapped': unmapped}
+                print(f'[done] {path} -> {", ".join(outputs)}')
+                if unmapped:
+                    print(f'[warn] {path}: 매핑되지 않은 팀명 {len(unmapped)}개: {", ".join(unmapped)}')
+                if duplicates:
+                    print(f'[warn] {path}: 앞선 입력과 겹치는 경기 {duplicates}개 제외')
+
+    save_manifest(out_dir, manifest)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='football-data.co.uk 원본 CSV를 앱용 시즌 파일로 변환')
+    parser.add_argument('inputs', nargs='*', default=['E0.csv'], help='원본 CSV 파일, 디렉터리 또는 glob 패턴')
+    parser.add_argument('-o', '--out-dir', default='.', help='출력 디렉터리')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='동시에 처리할 프로세스 수 (기본: CPU 수)')
+    parser.add_argument('-f', '--force', action='store_true', help='변경되지 않은 파일도 다시 처리')
+    parser.add_argument('-c', '--chunksize', type=int, default=None, help='큰 파일을 이 행 수만큼씩 나눠 처리')
+    args = parser.parse_args()
+    run_batch(args.inputs, args.out_dir, args.workers, args.force, args.chunksize)
 
-# 결과 CSV로 저장 (index 제외)
-df_filtered.to_csv('epl_24_25.csv', index=False)
 
+if __name__ == '__main__':
+    main()
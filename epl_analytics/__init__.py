@@ -0,0 +1,51 @@
+import importlib
+
+# Streamlit 없이 쓸 수 있는 EPL 분석 코어
+# 하위 모듈은 해당 이름을 처음 사용할 때 import (패키지 import 자체는 pandas/numpy를 불러오지 않음)
+_EXPORTS = {
+    "data": ["SEASON_DTYPES", "read_season_csv", "append_season_rows", "load_season", "build_match_store"],
+    "columnar": [
+        "MATCH_ARRAY_DTYPES", "pack_matches", "save_match_arrays", "load_match_arrays", "match_arrays_nbytes",
+        "take_matches", "arrays_to_frame", "standings_from_arrays", "match_index_from_arrays",
+        "probability_matrix_from_arrays",
+    ],
+    "index": [
+        "encode_teams", "build_match_index", "index_team_codes", "extend_match_index", "index_team_id", "pair_rows", "team_rows",
+        "head_to_head_rows",
+    ],
+    "standings": [
+        "STANDINGS_COLUMNS", "CUMULATIVE_STATS", "calculate_standings", "tally_standings", "build_standings_cube",
+        "extend_standings_cube", "standings_at",
+    ],
+    "probabilities": [
+        "ODDS_COLUMNS", "odds_to_probabilities", "build_probability_matrix", "pair_probability_matrix",
+        "extend_probability_matrix", "probability_table", "calculate_win_probabilities", "calculate_game_probabilities",
+    ],
+    "head_to_head": ["HEAD_TO_HEAD_COLUMNS", "head_to_head_records", "head_to_head_summary"],
+    "live": ["open_live_season", "attach_live_ratings", "append_live_rows", "poll_live_season", "live_standings"],
+    "form": ["TEAM_MATCH_COLUMNS", "FORM_STATS", "build_team_matches", "rolling_form", "team_form_rows"],
+    "ratings": [
+        "ELO_PARAMS", "new_rating_state", "elo_probabilities", "update_ratings", "rating_table", "rating_win_probabilities",
+        "rating_game_probabilities", "rating_win_matrix", "log_loss", "backtest_log_loss",
+    ],
+    "cards": ["MATCH_CARD_TEMPLATE", "format_match_row", "format_match_rows"],
+    "simulation": [
+        "ROUND_NAMES", "bracket_win_matrix", "simulate_bracket", "simulate_bracket_parallel", "bracket_probabilities",
+        "simulate_season", "projection_table",
+    ],
+}
+_MODULE_OF = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_MODULE_OF)
+
+
+def __getattr__(name):
+    if name not in _MODULE_OF:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_MODULE_OF[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,86 @@
+import string
+
+import numpy as np
+
+
+# 팀별 분석 경기 카드 HTML
+MATCH_CARD_TEMPLATE = """
+    <div style="padding:10px; margin-bottom:10px; border:1px solid #ddd; border-radius:8px; background-color:#f9f9f9;">
+        <div style="font-size:0.85em; color:gray; margin-bottom:4px;">{date}</div>
+        <div style="font-size:0.85em; color:gray; margin-bottom:4px;">
+            <span>{left_ha}</span> vs <span>{right_ha}</span>
+        </div>
+        <div style="font-size:1.1em; display:flex; align-items:center; justify-content:center; gap:6px; color:black;">
+            <span style="{left_style}">{left_team}</span>
+            <span style="{left_style}">{left_score}</span>
+            <span style="font-weight:bold; margin: 0 6px;">vs</span>
+            <span style="{right_style}">{right_score}</span>
+            <span style="{right_style}">{right_team}</span>
+        </div>
+    </div>
+    """
+BOLD_STYLE = "font-weight:bold;"
+NORMAL_STYLE = "font-weight:normal;"
+
+
+# 팀별 분석 HTML 포맷팅 함수
+def format_match_row(date, home_team, home_score, away_score, away_team, highlight_team):
+    # 승리한 팀 볼드 처리
+    if home_score > away_score:
+        home_style = BOLD_STYLE
+        away_style = NORMAL_STYLE
+    elif home_score < away_score:
+        home_style = NORMAL_STYLE
+        away_style = BOLD_STYLE
+    else:  # 무승부
+        home_style = NORMAL_STYLE
+        away_style = NORMAL_STYLE
+
+    # highlight_team을 왼쪽으로 오게 강제
+    if home_team == highlight_team:
+        left_team, left_score, left_style, left_ha = home_team, home_score, home_style, "홈"
+        right_team, right_score, right_style, right_ha = away_team, away_score, away_style, "원정"
+    else:
+        left_team, left_score, left_style, left_ha = away_team, away_score, away_style, "원정"
+        right_team, right_score, right_style, right_ha = home_team, home_score, home_style, "홈"
+
+    return MATCH_CARD_TEMPLATE.format(
+        date=date, left_ha=left_ha, right_ha=right_ha,
+        left_team=left_team, left_score=left_score, left_style=left_style,
+        right_team=right_team, right_score=right_score, right_style=right_style,
+    )
+
+
+# 여러 경기 카드를 한 번에 만들어 하나의 HTML 문자열로 반환 (format_match_row와 같은 출력)
+def format_match_rows(matches, highlight_team, date_col="날짜"):
+    home_team = matches["홈 팀"].astype(str).to_numpy(dtype=object)
+    away_team = matches["원정 팀"].astype(str).to_numpy(dtype=object)
+    home_score = matches["홈 팀 득점"].to_numpy()
+    away_score = matches["원정 팀 득점"].to_numpy()
+
+    # 승리한 팀 볼드 처리, highlight_team을 왼쪽으로
+    home_style = np.where(home_score > away_score, BOLD_STYLE, NORMAL_STYLE).astype(object)
+    away_style = np.where(home_score < away_score, BOLD_STYLE, NORMAL_STYLE).astype(object)
+    is_home = home_team == highlight_team
+    home_score = home_score.astype(str).astype(object)
+    away_score = away_score.astype(str).astype(object)
+
+    fields = {
+        "date": matches[date_col].dt.strftime("%Y-%m-%d").to_numpy(dtype=object),
+        "left_ha": np.where(is_home, "홈", "원정").astype(object),
+        "right_ha": np.where(is_home, "원정", "홈").astype(object),
+        "left_team": np.where(is_home, home_team, away_team),
+        "left_score": np.where(is_home, home_score, away_score),
+        "left_style": np.where(is_home, home_style, away_style),
+        "right_team": np.where(is_home, away_team, home_team),
+        "right_score": np.where(is_home, away_score, home_score),
+        "right_style": np.where(is_home, away_style, home_style),
+    }
+
+    # 템플릿의 고정 문자열과 필드 배열을 순서대로 이어 붙임
+    cards = np.full(len(matches), "", dtype=object)
+    for literal, field, _, _ in string.Formatter().parse(MATCH_CARD_TEMPLATE):
+        cards = cards + literal
+        if field:
+            cards = cards + fields[field]
+    return "".join(cards)
@@ -0,0 +1,92 @@
+import argparse
+import glob
+import os
+
+import numpy as np
+
+from .columnar import pack_matches, save_match_arrays
+from .data import build_match_store, load_season
+from .head_to_head import head_to_head_records
+from .index import build_match_index
+from .probabilities import build_probability_matrix, probability_table
+from .ratings import backtest_log_loss, new_rating_state, rating_table, update_ratings
+from .standings import calculate_standings
+
+# 전체 시즌 합산 보고서 디렉터리 이름
+ALL_SEASONS_LABEL = "all_seasons"
+
+
+def season_label(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+# 시즌(또는 전체 시즌) 데이터 하나에 대한 보고서 테이블
+def build_report(df):
+    index = build_match_index(df)
+    standings = calculate_standings(df)
+    standings.insert(0, "순위", range(1, len(standings) + 1))
+    return {
+        "standings": standings,
+        "probabilities": probability_table(index, build_probability_matrix(df, index)),
+        "head_to_head": head_to_head_records(df),
+    }
+
+
+def write_report(tables, out_dir, fmt):
+    os.makedirs(out_dir, exist_ok=True)
+    for name, table in tables.items():
+        path = os.path.join(out_dir, f"{name}.{fmt}")
+        if fmt == "json":
+            table.to_json(path, orient="records", force_ascii=False, indent=2)
+        else:
+            # 엑셀에서 한글이 깨지지 않도록 BOM 포함
+            table.to_csv(path, index=False, encoding="utf-8-sig")
+        print(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m epl_analytics",
+        description="시즌별 순위표, 전체 쌍 승률 행렬, 상대 전적을 계산해 파일로 저장",
+    )
+    parser.add_argument("inputs", nargs="*", help="시즌 CSV 파일 또는 glob 패턴 (기본: epl_*.csv)")
+    parser.add_argument("-o", "--out-dir", default="reports", help="출력 디렉터리")
+    parser.add_argument("-f", "--format", choices=["csv", "json"], default="csv", help="출력 형식")
+    parser.add_argument("--no-all-seasons", action="store_true", help="전체 시즌 합산 보고서 생략")
+    parser.add_argument("--pack-dir", help="시즌별 압축 경기 배열(.npy)을 저장할 디렉터리 (팀 이름표는 입력 전체가 공유)")
+    args = parser.parse_args(argv)
+
+    paths = []
+    for pattern in args.inputs or ["epl_*.csv"]:
+        paths.extend(sorted(glob.glob(pattern)) or [pattern])
+    if not paths:
+        parser.error("시즌 CSV 파일을 찾을 수 없습니다.")
+
+    season_frames = [(season_label(path), load_season(path)) for path in paths]
+    for label, season_df in season_frames:
+        write_report(build_report(season_df), os.path.join(args.out_dir, label), args.format)
+
+    if args.pack_dir:
+        teams = ()
+        for label, season_df in season_frames:
+            arrays = pack_matches(season_df, teams)
+            teams = arrays["teams"]
+            save_match_arrays(arrays, os.path.join(args.pack_dir, label))
+            print(os.path.join(args.pack_dir, label))
+
+    if not args.no_all_seasons and len(season_frames) > 1:
+        store, _ = build_match_store(season_frames)
+        tables = build_report(store)
+
+        # 입력 순서대로 Elo 레이팅을 누적하고 배당률 예측과 로그 손실 비교
+        state, elo_probs = new_rating_state(), []
+        for label, season_df in season_frames:
+            state, season_probs = update_ratings(state, season_df, label)
+            elo_probs.append(season_probs)
+        tables["ratings"] = rating_table(state)
+        tables["backtest"] = backtest_log_loss(store, np.concatenate(elo_probs))
+        write_report(tables, os.path.join(args.out_dir, ALL_SEASONS_LABEL), args.format)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .index import index_team_codes
+from .probabilities import ODDS_COLUMNS, pair_probability_matrix
+from .standings import tally_standings
+
+# 압축 경기 배열 컬럼별 타입 (팀명은 공유 이름표의 번호로만 저장)
+# result: 0 = 홈 승, 1 = 무, 2 = 원정 승, -1 = 결과 없음 / day: 1970-01-01 기준 일수
+MATCH_ARRAY_DTYPES = {
+    "home": np.int16,
+    "away": np.int16,
+    "home_goals": np.int8,
+    "away_goals": np.int8,
+    "result": np.int8,
+    "odds": np.float32,
+    "day": np.int32,
+}
+RESULT_LABELS = ["H", "D", "A"]
+TEAMS_FILE = "teams.json"
+
+# 전체 시즌 통합 데이터(시즌 컬럼이 있는 경우)만 가지는 시즌 번호 배열과 시즌 이름표
+SEASON_DTYPE = np.int8
+SEASONS_FILE = "seasons.json"
+NAME_TABLES = ["teams", "seasons"]
+
+
+# 팀명 → 이름표 번호 (category 컬럼이면 고유값만 찾아서 코드로 펼침)
+def _team_codes(series, team_index):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return team_index.get_indexer(series.cat.categories.astype(str))[series.cat.codes]
+    return team_index.get_indexer(series.astype(str))
+
+
+# 시즌 DataFrame → 압축 배열 (teams로 기존 이름표를 넘기면 새 팀만 뒤에 추가해 여러 리그/시즌이 같은 번호를 씀)
+# build_match_store 결과에 그 팀 표를 넘기면 팀 번호가 통합 데이터의 고정 팀 ID와 같음
+def pack_matches(df, teams=()):
+    names = pd.unique(np.concatenate([np.asarray(pd.unique(df[col]), dtype=str) for col in ["홈 팀", "원정 팀"]]))
+    known = set(teams)
+    teams = tuple(teams) + tuple(name for name in names if name not in known)
+    if len(teams) > np.iinfo(np.int16).max:
+        raise ValueError(f"팀 수가 int16 범위를 넘습니다: {len(teams)}")
+    team_index = pd.Index(teams)
+
+    arrays = {
+        "teams": teams,
+        "home": _team_codes(df["홈 팀"], team_index),
+        "away": _team_codes(df["원정 팀"], team_index),
+        "home_goals": df["홈 팀 득점"].to_numpy(),
+        "away_goals": df["원정 팀 득점"].to_numpy(),
+        "result": pd.Categorical(df["경기 결과"], categories=RESULT_LABELS).codes,
+        "odds": df[ODDS_COLUMNS].to_numpy(),
+        "day": df["날짜"].to_numpy().astype("datetime64[D]").astype(np.int64),
+    }
+    for name, dtype in MATCH_ARRAY_DTYPES.items():
+        arrays[name] = np.ascontiguousarray(arrays[name], dtype=dtype)
+    if "시즌" in df.columns:
+        seasons = df["시즌"].astype("category")
+        arrays["seasons"] = tuple(seasons.cat.categories.astype(str))
+        arrays["season"] = np.ascontiguousarray(seasons.cat.codes, dtype=SEASON_DTYPE)
+    return arrays
+
+
+# 컬럼별 .npy 파일 + 이름표 JSON으로 저장
+def save_match_arrays(arrays, directory):
+    os.makedirs(directory, exist_ok=True)
+    for name in MATCH_ARRAY_DTYPES:
+        np.save(os.path.join(directory, f"{name}.npy"), arrays[name])
+    with open(os.path.join(directory, TEAMS_FILE), "w", encoding="utf-8") as f:
+        json.dump(list(arrays["teams"]), f, ensure_ascii=False)
+    if "season" in arrays:
+        np.save(os.path.join(directory, "season.npy"), arrays["season"])
+        with open(os.path.join(directory, SEASONS_FILE), "w", encoding="utf-8") as f:
+            json.dump(list(arrays["seasons"]), f, ensure_ascii=False)
+
+
+# mmap=True면 읽기 전용 메모리 맵으로 열어 실제로 접근하는 부분만 읽음 (여러 프로세스가 페이지 캐시를 공유)
+def load_match_arrays(directory, mmap=True):
+    with open(os.path.join(directory, TEAMS_FILE), encoding="utf-8") as f:
+        arrays = {"teams": tuple(json.load(f))}
+    for name in MATCH_ARRAY_DTYPES:
+        arrays[name] = np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r" if mmap else None)
+    if os.path.exists(os.path.join(directory, SEASONS_FILE)):
+        with open(os.path.join(directory, SEASONS_FILE), encoding="utf-8") as f:
+            arrays["seasons"] = tuple(json.load(f))
+        arrays["season"] = np.load(os.path.join(directory, "season.npy"), mmap_mode="r" if mmap else None)
+    return arrays
+
+
+def match_arrays_nbytes(arrays):
+    return sum(value.nbytes for name, value in arrays.items() if name not in NAME_TABLES)
+
+
+# rows 행만 고른 압축 배열 (이름표는 그대로 공유)
+def take_matches(arrays, rows):
+    return {name: value if name in NAME_TABLES else value[rows] for name, value in arrays.items()}
+
+
+# 화면 표시용 DataFrame (load_season과 같은 컬럼/타입, rows를 주면 그 행만 만듦)
+# 팀 ID 컬럼도 넣어 두므로 encode_teams/build_match_index 등이 이름표 번호를 그대로 사용
+def arrays_to_frame(arrays, rows=None):
+    if rows is not None:
+        arrays = take_matches(arrays, rows)
+    teams = list(arrays["teams"])
+    frame = pd.DataFrame({
+        "날짜": pd.to_datetime(np.asarray(arrays["day"]).astype("datetime64[D]")),
+        "홈 팀": pd.Categorical.from_codes(arrays["home"], categories=teams),
+        "원정 팀": pd.Categorical.from_codes(arrays["away"], categories=teams),
+        "홈 팀 득점": arrays["home_goals"],
+        "원정 팀 득점": arrays["away_goals"],
+        "경기 결과": pd.Categorical.from_codes(arrays["result"], categories=RESULT_LABELS),
+        ODDS_COLUMNS[0]: arrays["odds"][:, 0],
+        ODDS_COLUMNS[1]: arrays["odds"][:, 1],
+        ODDS_COLUMNS[2]: arrays["odds"][:, 2],
+        "홈 팀 ID": arrays["home"],
+        "원정 팀 ID": arrays["away"],
+    })
+    if "season" in arrays:
+        frame.insert(0, "시즌", pd.Categorical.from_codes(arrays["season"], categories=list(arrays["seasons"]), ordered=True))
+    return frame
+
+
+# 압축 배열에서 바로 순위표 계산 (이름표에만 있고 경기가 없는 팀은 제외)
+def standings_from_arrays(arrays):
+    standings = tally_standings(
+        np.asarray(arrays["teams"], dtype=object),
+        arrays["home"],
+        arrays["away"],
+        arrays["home_goals"],
+        arrays["away_goals"],
+        arrays["result"] == 0,
+        arrays["result"] == 2,
+    )
+    return standings[standings["경기"] > 0]
+
+
+# 압축 배열에서 바로 경기 인덱스 / 확률 행렬 계산 (팀 번호는 이름표 번호)
+def match_index_from_arrays(arrays):
+    return index_team_codes(arrays["teams"], arrays["home"], arrays["away"])
+
+
+def probability_matrix_from_arrays(arrays):
+    return pair_probability_matrix(arrays["home"], arrays["away"], arrays["odds"], len(arrays["teams"]))
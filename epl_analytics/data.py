@@ -0,0 +1,87 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+
+# 시즌 데이터 컬럼 타입
+SEASON_DTYPES = {
+    "홈 팀": "category",
+    "원정 팀": "category",
+    "홈 팀 득점": "int8",
+    "원정 팀 득점": "int8",
+    "경기 결과": "category",
+    "홈 승 배당률": "float32",
+    "무승부 배당률": "float32",
+    "원정 승 배당률": "float32",
+}
+SEASON_CACHE_VERSION = "1"
+
+
+def read_season_csv(path, **kwargs):
+    return pd.read_csv(path, dtype=SEASON_DTYPES, parse_dates=["날짜"], date_format="%Y/%m/%d", **kwargs)
+
+
+# 시즌 데이터 끝에 경기를 이어 붙임 (category 컬럼은 기존 범주 뒤에 새 값만 추가)
+def append_season_rows(df, new_rows):
+    combined = pd.concat([df, new_rows], ignore_index=True)
+    for col, dtype in SEASON_DTYPES.items():
+        if dtype == "category":
+            combined[col] = pd.api.types.union_categoricals([df[col], new_rows[col]])
+    return combined
+
+
+# CSV 옆에 저장하는 parquet 캐시 (원본 파일의 크기/수정 시각이 바뀌면 무효화)
+def load_season(path):
+    stat = os.stat(path)
+    cache_path = os.path.splitext(path)[0] + ".parquet"
+    cache_key = {
+        b"cache_version": SEASON_CACHE_VERSION.encode(),
+        b"source_size": str(stat.st_size).encode(),
+        b"source_mtime_ns": str(stat.st_mtime_ns).encode(),
+    }
+    # pyarrow는 캐시를 읽고 쓸 때만 import (없으면 CSV를 그대로 사용)
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        return read_season_csv(path)
+
+    if os.path.exists(cache_path):
+        try:
+            metadata = pq.read_schema(cache_path).metadata or {}
+            if all(metadata.get(key) == value for key, value in cache_key.items()):
+                return pq.read_table(cache_path).to_pandas()
+        except (OSError, pa.ArrowInvalid):
+            pass
+
+    df = read_season_csv(path)
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), **cache_key})
+        pq.write_table(table, cache_path)
+    except OSError:
+        pass  # 읽기 전용 환경에서는 캐시 없이 사용
+    return df
+
+
+# 전체 시즌 통합 데이터 (팀 ID는 시즌 순서대로 처음 등장한 순서로 고정, 인덱스/확률 행렬/팀-경기 테이블이 이 ID를 사용)
+def build_match_store(season_frames):
+    frames = []
+    for season, season_df in season_frames:
+        season_df = season_df.copy()
+        season_df.insert(0, "시즌", season)
+        frames.append(season_df)
+    store = pd.concat(frames, ignore_index=True)
+
+    # 시즌 순서 > 날짜 순서로 팀을 나열해 시즌이 추가되어도 기존 ID가 바뀌지 않게 함
+    order = np.argsort(store["날짜"].to_numpy(), kind="stable")
+    ordered = store.iloc[order]
+    team_names = pd.unique(np.column_stack([ordered["홈 팀"].astype(str), ordered["원정 팀"].astype(str)]).ravel())
+
+    seasons = [season for season, _ in season_frames]
+    store["시즌"] = pd.Categorical(store["시즌"], categories=seasons, ordered=True)
+    for col in ["홈 팀", "원정 팀"]:
+        store[col] = pd.Categorical(store[col].astype(str), categories=team_names)
+        store[f"{col} ID"] = store[col].cat.codes.astype(np.int16)
+    return store, pd.Index(team_names)
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+from .index import encode_teams
+from .probabilities import ODDS_COLUMNS, odds_to_probabilities
+
+# 팀-경기 테이블 컬럼 (경기마다 홈 팀/원정 팀 관점 두 행)
+TEAM_MATCH_COLUMNS = ["구단 ID", "상대 ID", "날짜", "장소", "득점", "실점", "승점", "xPts", "경기 행"]
+
+# 최근 폼으로 합산하는 지표
+FORM_STATS = ["승점", "득실차", "xPts"]
+
+
+# 경기 데이터 → 팀-경기 롱 포맷 (구단 ID > 날짜 순 정렬, 구단 ID는 encode_teams/build_match_index와 같음)
+# xPts: 배당률 확률로 본 기대 승점 (3 × 승 확률 + 무 확률, 배당률이 없으면 NaN)
+def build_team_matches(df):
+    _, home_idx, away_idx = encode_teams(df)
+    n_matches = len(df)
+    home_goals = df["홈 팀 득점"].to_numpy(dtype=np.int16)
+    away_goals = df["원정 팀 득점"].to_numpy(dtype=np.int16)
+    probs, _ = odds_to_probabilities(df[ODDS_COLUMNS].to_numpy(dtype=np.float64))
+
+    goals_for = np.concatenate([home_goals, away_goals])
+    goals_against = np.concatenate([away_goals, home_goals])
+    points = np.where(goals_for > goals_against, 3, np.where(goals_for == goals_against, 1, 0)).astype(np.int8)
+    expected_points = np.concatenate([3 * probs[:, 0] + probs[:, 1], 3 * probs[:, 2] + probs[:, 1]])
+
+    team_ids = np.concatenate([home_idx, away_idx])
+    rows = np.concatenate([np.arange(n_matches), np.arange(n_matches)])
+    dates = np.concatenate([df["날짜"].to_numpy(), df["날짜"].to_numpy()])
+    order = np.lexsort((rows, dates, team_ids))
+
+    return pd.DataFrame({
+        "구단 ID": team_ids[order].astype(np.int16),
+        "상대 ID": np.concatenate([away_idx, home_idx])[order].astype(np.int16),
+        "날짜": dates[order],
+        "장소": pd.Categorical.from_codes(np.repeat([0, 1], n_matches)[order], categories=["홈", "원정"]),
+        "득점": goals_for[order],
+        "실점": goals_against[order],
+        "승점": points[order],
+        "xPts": expected_points[order].astype(np.float32),
+        "경기 행": rows[order],
+    })[TEAM_MATCH_COLUMNS]
+
+
+# 팀별 최근 window경기 합계 (누적합 차이로 모든 팀을 한 번에 계산, 경기 수가 모자란 초반은 있는 경기만 합산)
+def rolling_form(team_matches, window=5):
+    team_ids = team_matches["구단 ID"].to_numpy()
+    values = np.column_stack([
+        team_matches["승점"].to_numpy(dtype=np.float64),
+        team_matches["득점"].to_numpy(dtype=np.float64) - team_matches["실점"].to_numpy(dtype=np.float64),
+        np.nan_to_num(team_matches["xPts"].to_numpy(dtype=np.float64)),
+    ])
+
+    # 팀 시작 위치 기준으로 window 앞 위치를 구함 (같은 팀 안에서만 합산)
+    positions = np.arange(len(team_matches))
+    team_starts = np.searchsorted(team_ids, team_ids, side="left")
+    window_starts = np.maximum(positions - window + 1, team_starts)
+
+    cumulative = np.vstack([np.zeros((1, values.shape[1])), np.cumsum(values, axis=0)])
+    sums = cumulative[positions + 1] - cumulative[window_starts]
+
+    form = team_matches[["구단 ID", "날짜"]].copy()
+    form["경기 수"] = positions - window_starts + 1
+    for k, name in enumerate(FORM_STATS):
+        form[f"최근 {name}"] = sums[:, k]
+    return form
+
+
+# 한 팀의 행 구간 (build_team_matches 결과는 구단 ID 순으로 정렬되어 있음)
+def team_form_rows(team_matches, team_id):
+    team_ids = team_matches["구단 ID"].to_numpy()
+    return np.arange(np.searchsorted(team_ids, team_id, side="left"), np.searchsorted(team_ids, team_id, side="right"))
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from .index import encode_teams
+
+# (구단, 상대) 쌍별 전적 컬럼
+HEAD_TO_HEAD_COLUMNS = ["구단", "상대", "경기", "승", "무", "패", "득점", "실점"]
+
+
+# 모든 (구단, 상대) 쌍의 전적을 홈/원정 관점 합산으로 한 번에 집계 (경기 기록이 있는 쌍만)
+def head_to_head_records(df):
+    teams, home_idx, away_idx = encode_teams(df)
+    n_teams = len(teams)
+    home_key = home_idx.astype(np.int64) * n_teams + away_idx
+    away_key = away_idx.astype(np.int64) * n_teams + home_idx
+
+    home_score = df["홈 팀 득점"].to_numpy(dtype=np.int64)
+    away_score = df["원정 팀 득점"].to_numpy(dtype=np.int64)
+    result = df["경기 결과"].to_numpy()
+    home_win = result == "H"
+    away_win = result == "A"
+    draw = ~(home_win | away_win)
+
+    def tally(home_values, away_values):
+        home_total = np.bincount(home_key, weights=home_values, minlength=n_teams * n_teams)
+        away_total = np.bincount(away_key, weights=away_values, minlength=n_teams * n_teams)
+        return (home_total + away_total).astype(np.int64)
+
+    ones = np.ones(len(df))
+    stats = {
+        "경기": tally(ones, ones),
+        "승": tally(home_win, away_win),
+        "무": tally(draw, draw),
+        "패": tally(away_win, home_win),
+        "득점": tally(home_score, away_score),
+        "실점": tally(away_score, home_score),
+    }
+    played = np.flatnonzero(stats["경기"])
+    records = pd.DataFrame({
+        "구단": np.asarray(teams, dtype=object)[played // n_teams],
+        "상대": np.asarray(teams, dtype=object)[played % n_teams],
+        **{name: values[played] for name, values in stats.items()},
+    })
+    return records[HEAD_TO_HEAD_COLUMNS].sort_values(by=["구단", "상대"]).reset_index(drop=True)
+
+
+# 주어진 경기들에서 team 기준 승/무/패
+def head_to_head_summary(matches, team):
+    total_matches = len(matches)
+    home_wins = ((matches["홈 팀"] == team) & (matches["경기 결과"] == "H")).sum()
+    away_wins = ((matches["원정 팀"] == team) & (matches["경기 결과"] == "A")).sum()
+    draws = (matches["경기 결과"] == "D").sum()
+    return {
+        "승": int(home_wins + away_wins),
+        "무": int(draws),
+        "패": int(total_matches - (home_wins + away_wins + draws)),
+    }
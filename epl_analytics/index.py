@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+
+# 홈 팀 등장 순서를 기준으로 팀 번호 부여 (원정에만 등장한 팀은 뒤에 추가)
+# 전체 시즌 통합 데이터(build_match_store)는 저장된 고정 팀 ID와 팀 표를 그대로 사용
+def encode_teams(df):
+    if "홈 팀 ID" in df.columns:
+        teams = np.asarray(df["홈 팀"].cat.categories, dtype=object)
+        return teams, df["홈 팀 ID"].to_numpy(), df["원정 팀 ID"].to_numpy()
+    teams = pd.unique(pd.concat([df["홈 팀"], df["원정 팀"]], ignore_index=True))
+    team_index = pd.Index(teams)
+    return teams, team_index.get_indexer(df["홈 팀"]), team_index.get_indexer(df["원정 팀"])
+
+
+# (홈 팀, 원정 팀) 쌍 / 팀별 경기 행 번호 인덱스
+def build_match_index(df):
+    return index_team_codes(*encode_teams(df))
+
+
+# 팀 번호 배열로 인덱스 생성 (DataFrame과 압축 배열 형식이 같이 사용)
+def index_team_codes(teams, home_idx, away_idx):
+    n_teams = len(teams)
+    rows = np.arange(len(home_idx))
+
+    # 쌍 키(home * 팀 수 + away)로 정렬해 두고 이진 탐색으로 구간 조회
+    pair_keys = home_idx.astype(np.int64) * n_teams + away_idx
+    pair_order = np.argsort(pair_keys, kind="stable")
+
+    # 팀 번호 > 행 번호 순으로 정렬한 뒤 팀별 시작 위치 기록
+    team_ids = np.concatenate([home_idx, away_idx])
+    team_rows = np.concatenate([rows, rows])
+    team_order = np.lexsort((team_rows, team_ids))
+    team_starts = np.concatenate([[0], np.cumsum(np.bincount(team_ids, minlength=n_teams))])
+
+    return {
+        "teams": pd.Index(teams),
+        "pair_keys": pair_keys[pair_order],
+        "pair_rows": rows[pair_order],
+        "team_starts": team_starts,
+        "team_rows": team_rows[team_order],
+    }
+
+
+def index_team_id(index, team):
+    return index["teams"].get_indexer([team])[0]
+
+
+def pair_rows(index, home_team, away_team):
+    home_id, away_id = index_team_id(index, home_team), index_team_id(index, away_team)
+    if home_id < 0 or away_id < 0:
+        return index["pair_rows"][:0]
+    key = home_id * len(index["teams"]) + away_id
+    lo, hi = np.searchsorted(index["pair_keys"], [key, key + 1])
+    return index["pair_rows"][lo:hi]
+
+
+def team_rows(index, team):
+    team_id = index_team_id(index, team)
+    if team_id < 0:
+        return index["team_rows"][:0]
+    return index["team_rows"][index["team_starts"][team_id]:index["team_starts"][team_id + 1]]
+
+
+# 두 팀 간 모든 경기 (홈/원정 무관, 행 순서 유지)
+def head_to_head_rows(index, team1, team2):
+    return np.sort(np.concatenate([pair_rows(index, team1, team2), pair_rows(index, team2, team1)]))
+
+
+# 끝에 추가된 경기(행 번호 start부터)를 기존 인덱스에 끼워 넣음 (전체 정렬 없이 삽입 위치만 이진 탐색)
+# home_idx/away_idx: 추가된 경기의 팀 번호 (기존 인덱스에 없는 팀이면 build_match_index로 다시 만들어야 함)
+def extend_match_index(index, home_idx, away_idx, start):
+    n_teams = len(index["teams"])
+    rows = start + np.arange(len(home_idx))
+
+    pair_keys = home_idx.astype(np.int64) * n_teams + away_idx
+    pair_order = np.lexsort((rows, pair_keys))
+    pair_pos = np.searchsorted(index["pair_keys"], pair_keys[pair_order], side="right")
+
+    # 새 행은 기존 행보다 뒤이므로 각 팀 구간의 끝에 붙음
+    team_ids = np.concatenate([home_idx, away_idx])
+    team_rows = np.concatenate([rows, rows])
+    team_order = np.lexsort((team_rows, team_ids))
+    team_pos = index["team_starts"][team_ids[team_order] + 1]
+    added = np.concatenate([[0], np.cumsum(np.bincount(team_ids, minlength=n_teams))])
+
+    return {
+        "teams": index["teams"],
+        "pair_keys": np.insert(index["pair_keys"], pair_pos, pair_keys[pair_order]),
+        "pair_rows": np.insert(index["pair_rows"], pair_pos, rows[pair_order]),
+        "team_starts": index["team_starts"] + added,
+        "team_rows": np.insert(index["team_rows"], team_pos, team_rows[team_order]),
+    }
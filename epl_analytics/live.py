@@ -0,0 +1,139 @@
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+from .data import append_season_rows, read_season_csv
+from .index import build_match_index, encode_teams, extend_match_index
+from .probabilities import ODDS_COLUMNS, build_probability_matrix, extend_probability_matrix
+from .ratings import update_ratings
+from .standings import build_standings_cube, extend_standings_cube, standings_at
+
+# 시즌 중 결과가 계속 추가되는 CSV를 이어 읽는 상태
+# offset: 지금까지 읽은 바이트 수 (완성된 줄까지만), tail: offset 직전 바이트 (앞부분이 바뀌었는지 확인용)
+TAIL_CHECK_BYTES = 64
+
+
+# 팀 이름 컬럼을 teams 순서의 범주로 맞추고 팀 ID 컬럼을 붙임
+# 실시간 시즌의 인덱스/누적 순위/압축 배열/팀-경기 테이블이 모두 처음 열 때 정한 팀 번호를 그대로 씀 (새 팀은 뒤에 추가)
+def _with_team_ids(df, teams):
+    team_index = pd.Index(teams)
+    home_idx = team_index.get_indexer(df["홈 팀"].astype(str))
+    away_idx = team_index.get_indexer(df["원정 팀"].astype(str))
+    return _set_team_codes(df, pd.CategoricalDtype(teams), home_idx, away_idx)
+
+
+def _set_team_codes(df, dtype, home_idx, away_idx):
+    return df.assign(**{
+        "홈 팀": pd.Categorical.from_codes(home_idx, dtype=dtype),
+        "원정 팀": pd.Categorical.from_codes(away_idx, dtype=dtype),
+        "홈 팀 ID": home_idx.astype(np.int16),
+        "원정 팀 ID": away_idx.astype(np.int16),
+    })
+
+
+def _derived_tables(df):
+    index = build_match_index(df)
+    return {
+        "index": index,
+        "probs": build_probability_matrix(df, index),
+        "cube": build_standings_cube(df),
+    }
+
+
+# 파일 전체를 읽어 상태를 새로 만듦
+def open_live_season(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    offset = data.rfind(b"\n") + 1
+    df = read_season_csv(io.BytesIO(data[:offset]))
+    df = _with_team_ids(df, list(encode_teams(df)[0]))
+    return {
+        "path": path,
+        "offset": offset,
+        "tail": data[max(0, offset - TAIL_CHECK_BYTES):offset],
+        "columns": list(df.columns),
+        "df": df,
+        **_derived_tables(df),
+    }
+
+
+# 레이팅 체크포인트 연결: base(앞 시즌까지 반영한 레이팅 상태)에 이 시즌 경기를 반영해 둠
+# 이후 추가된 경기는 update_ratings의 processed 위치부터만 반영
+def attach_live_ratings(state, base, season):
+    ratings, rating_probs = update_ratings(base, state["df"], season)
+    return {**state, "rating_base": (base, season), "ratings": ratings, "rating_probs": rating_probs}
+
+
+def _live_ratings(state, df, incremental):
+    if "rating_base" not in state:
+        return {}
+    base, season = state["rating_base"]
+    if not incremental:
+        ratings, rating_probs = update_ratings(base, df, season)
+        return {"ratings": ratings, "rating_probs": rating_probs}
+    ratings, new_probs = update_ratings(state["ratings"], df, season)
+    return {"ratings": ratings, "rating_probs": np.concatenate([state["rating_probs"], new_probs])}
+
+
+# 추가된 경기만 반영한 새 상태 (입력 상태는 바꾸지 않으므로 다른 세션이 읽는 중이어도 안전)
+# 새 팀이 나오거나 마지막 날짜보다 앞선 경기가 추가되면 파생 테이블과 레이팅 전체를 다시 계산
+def append_live_rows(state, new_rows):
+    start = len(state["df"])
+    teams = list(state["index"]["teams"])
+    # 추가된 경기의 팀 번호만 기존 인덱스에서 찾음 (-1이면 새 팀)
+    home_idx = state["index"]["teams"].get_indexer(new_rows["홈 팀"].astype(str))
+    away_idx = state["index"]["teams"].get_indexer(new_rows["원정 팀"].astype(str))
+
+    tables = None
+    if (home_idx < 0).any() or (away_idx < 0).any():
+        # 새 팀은 기존 번호 뒤에 붙이고 전체 데이터의 팀 ID를 다시 매김
+        new_teams = pd.unique(pd.concat([new_rows["홈 팀"], new_rows["원정 팀"]], ignore_index=True).astype(str))
+        known = set(teams)
+        teams += [team for team in new_teams if team not in known]
+        df = _with_team_ids(append_season_rows(state["df"], new_rows), teams)
+    else:
+        df = append_season_rows(state["df"], _set_team_codes(new_rows, state["df"]["홈 팀"].dtype, home_idx, away_idx))
+        cube = extend_standings_cube(state["cube"], new_rows, home_idx, away_idx)
+        if cube is not None:
+            tables = {
+                "index": extend_match_index(state["index"], home_idx, away_idx, start),
+                "probs": extend_probability_matrix(
+                    state["probs"], home_idx, away_idx, new_rows[ODDS_COLUMNS].to_numpy()
+                ),
+                "cube": cube,
+            }
+    return {**state, "df": df, **(tables or _derived_tables(df)), **_live_ratings(state, df, tables is not None)}
+
+
+# 파일 크기가 늘었으면 끝부분만 읽어 반영
+# 반환값: (상태, 추가된 경기 수), 파일이 줄었거나 앞부분이 바뀌었으면 전체를 다시 읽고 추가 경기 수는 None
+def poll_live_season(state):
+    size = os.path.getsize(state["path"])
+    if size == state["offset"]:
+        return state, 0
+    with open(state["path"], "rb") as f:
+        f.seek(state["offset"] - len(state["tail"]))
+        unchanged = size > state["offset"] and f.read(len(state["tail"])) == state["tail"]
+        chunk = f.read() if unchanged else b""
+    if not unchanged:
+        reopened = open_live_season(state["path"])
+        if "rating_base" in state:
+            reopened = attach_live_ratings(reopened, *state["rating_base"])
+        return reopened, None
+
+    # 아직 쓰는 중인 마지막 줄은 다음 번에 읽음
+    end = chunk.rfind(b"\n") + 1
+    if end == 0:
+        return state, 0
+    new_rows = read_season_csv(io.BytesIO(chunk[:end]), header=None, names=state["columns"])
+    offset = state["offset"] + end
+    tail = (state["tail"] + chunk[:end])[-TAIL_CHECK_BYTES:]
+    return {**append_live_rows(state, new_rows), "offset": offset, "tail": tail}, len(new_rows)
+
+
+# 현재 상태의 순위표 (누적 배열의 마지막 날짜)
+def live_standings(state):
+    dates, teams, cube, positions = state["cube"]
+    return standings_at(teams, cube, positions, len(dates) - 1)
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+
+from .index import encode_teams, index_team_id, pair_rows
+
+
+# 배당률 → 확률 변환 (경기 수 × 3 배열을 한 번에 정규화)
+ODDS_COLUMNS = ["홈 승 배당률", "무승부 배당률", "원정 승 배당률"]
+
+
+def odds_to_probabilities(odds):
+    inverse_odds = 1 / odds  # (n, 3)
+    total_inverse = inverse_odds.sum(axis=1)  # (n,)
+    return inverse_odds / total_inverse[:, None], total_inverse - 1  # 정규화된 확률, 오버라운드
+
+
+# 팀 × 팀 × (홈 승, 무, 원정 승) 평균 확률 행렬
+def build_probability_matrix(df, index):
+    _, home_idx, away_idx = encode_teams(df)
+    return pair_probability_matrix(home_idx, away_idx, df[ODDS_COLUMNS].to_numpy(), len(index["teams"]))
+
+
+# 팀 번호/배당률 배열로 확률 행렬 집계 (DataFrame과 압축 배열 형식이 같이 사용)
+def pair_probability_matrix(home_idx, away_idx, odds, n_teams):
+    probs, overround = odds_to_probabilities(np.asarray(odds, dtype=np.float64))
+
+    # 배당률이 비어 있거나 0인 경기는 제외
+    valid = np.isfinite(probs).all(axis=1)
+    pair_keys = (home_idx.astype(np.int64) * n_teams + away_idx)[valid]
+    counts = np.bincount(pair_keys, minlength=n_teams * n_teams)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pair_probs = np.column_stack([
+            np.bincount(pair_keys, weights=probs[valid, k], minlength=n_teams * n_teams) for k in range(3)
+        ]) / counts[:, None]
+        pair_overround = np.bincount(pair_keys, weights=overround[valid], minlength=n_teams * n_teams) / counts
+
+    return {
+        "probs": pair_probs.reshape(n_teams, n_teams, 3),
+        "overround": pair_overround.reshape(n_teams, n_teams),
+        "counts": counts.reshape(n_teams, n_teams),
+    }
+
+
+# 추가된 경기의 배당률 확률을 기존 평균에 합침 (경기 수 가중 평균, 팀 번호는 기존 행렬과 같아야 함)
+def extend_probability_matrix(matrix, home_idx, away_idx, odds):
+    added = pair_probability_matrix(home_idx, away_idx, odds, matrix["counts"].shape[0])
+    counts = matrix["counts"] + added["counts"]
+
+    def merge(old, new, old_counts, new_counts):
+        total = np.nan_to_num(old) * old_counts + np.nan_to_num(new) * new_counts
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return total / (old_counts + new_counts)
+
+    return {
+        "probs": merge(matrix["probs"], added["probs"], matrix["counts"][..., None], added["counts"][..., None]),
+        "overround": merge(matrix["overround"], added["overround"], matrix["counts"], added["counts"]),
+        "counts": counts,
+    }
+
+
+# 다운로드용 확률 표 (경기 기록이 있는 쌍만)
+def probability_table(index, matrix):
+    home_ids, away_ids = np.nonzero(matrix["counts"])
+    probs = matrix["probs"][home_ids, away_ids]
+    return pd.DataFrame({
+        "홈 팀": index["teams"][home_ids],
+        "원정 팀": index["teams"][away_ids],
+        "경기 수": matrix["counts"][home_ids, away_ids],
+        "홈 승 확률": probs[:, 0],
+        "무승부 확률": probs[:, 1],
+        "원정 승 확률": probs[:, 2],
+        "오버라운드": matrix["overround"][home_ids, away_ids],
+    })
+
+
+# 승률 계산 함수 (미리 계산한 확률 행렬에서 조회)
+def calculate_win_probabilities(index, matrix, home_team, away_team):
+    home_id, away_id = index_team_id(index, home_team), index_team_id(index, away_team)
+
+    # 두 시나리오: 1) home_team이 홈일 때, 2) away_team이 홈일 때
+    def get_avg_probs(home, away):
+        if home < 0 or away < 0 or matrix["counts"][home, away] == 0:
+            return None
+        avg_probs = matrix["probs"][home, away]
+        return {
+            "home_win": avg_probs[0],
+            "draw": avg_probs[1],
+            "away_win": avg_probs[2]
+        }
+
+    return get_avg_probs(home_id, away_id), get_avg_probs(away_id, home_id)
+
+
+# 승부 예측 게임용 승률 (무승부 제외, 첫 경기 배당률 사용, 배당률은 압축 배열에서 한 행만 읽음)
+def calculate_game_probabilities(arrays, index, matrix, team1, team2):
+    if not isinstance(team1, str) or not isinstance(team2, str):
+        return 0.5, 0.5, 2.0, 2.0
+    rows = pair_rows(index, team1, team2)
+    home_id, away_id = index_team_id(index, team1), index_team_id(index, team2)
+    if len(rows) == 0 or matrix["counts"][home_id, away_id] == 0:
+        return 0.5, 0.5, 2.0, 2.0
+    # float32로 저장된 배당률을 소수 둘째 자리로 복원
+    home_odds, _, away_odds = (round(float(odds), 2) for odds in arrays["odds"][rows[0]])
+    # 무승부를 제외한 두 결과의 확률을 다시 정규화
+    home_win, _, away_win = matrix["probs"][home_id, away_id]
+    p_home = home_win / (home_win + away_win)
+    return p_home, 1 - p_home, home_odds, away_odds
@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+
+from .probabilities import ODDS_COLUMNS, odds_to_probabilities
+
+# Elo 레이팅 기본 설정
+# home_advantage: 홈 팀 레이팅 가산점, draw_rate: 전력이 같을 때의 무승부 확률
+# season_regression: 새 시즌 시작 시 평균으로 되돌리는 비율, promoted_offset: 새로 등장한 팀의 시작 레이팅 보정
+ELO_PARAMS = {
+    "initial": 1500.0,
+    "k": 25.0,
+    "home_advantage": 40.0,
+    "draw_rate": 0.27,
+    "season_regression": 0.2,
+    "promoted_offset": -80.0,
+}
+
+# 경기 결과 → 홈 팀 기준 점수 / (홈 승, 무, 원정 승) 열 번호
+RESULT_SCORES = {"H": 1.0, "D": 0.5, "A": 0.0}
+RESULT_CODES = {"H": 0, "D": 1, "A": 2}
+
+
+# 아무 경기도 반영하지 않은 레이팅 상태
+# processed: 시즌별로 반영한 행 수 (같은 시즌 파일에 경기가 추가되면 그 뒤부터만 반영)
+def new_rating_state(params=None):
+    return {
+        "params": {**ELO_PARAMS, **(params or {})},
+        "teams": {},
+        "ratings": [],
+        "processed": {},
+        "season": None,
+    }
+
+
+# 레이팅 차이 → (홈 승, 무, 원정 승) 확률 (배열 단위로 계산)
+def elo_probabilities(home_ratings, away_ratings, params=ELO_PARAMS):
+    diff = np.asarray(home_ratings, dtype=np.float64) + params["home_advantage"] - np.asarray(away_ratings, dtype=np.float64)
+    expected = 1 / (1 + 10 ** (-diff / 400))
+    # 전력 차이가 클수록 무승부 확률을 줄이고, 기대 점수는 그대로 유지
+    draw = params["draw_rate"] * (1 - np.abs(2 * expected - 1))
+    return np.stack([expected - draw / 2, draw, 1 - expected - draw / 2], axis=-1)
+
+
+# season 시즌 경기 중 아직 반영하지 않은 행만 날짜 순으로 반영
+# 반환값: 새 상태(입력 상태는 바꾸지 않음), 새로 반영한 경기의 경기 전 확률 (행 순서 그대로, (n, 3))
+def update_ratings(state, season_df, season):
+    params = state["params"]
+    teams = dict(state["teams"])
+    ratings = list(state["ratings"])
+    processed = dict(state["processed"])
+
+    # 새 시즌 시작: 기존 레이팅을 평균 쪽으로 당김
+    if state["season"] is not None and season != state["season"] and season not in processed and ratings:
+        mean = sum(ratings) / len(ratings)
+        ratings = [rating + params["season_regression"] * (mean - rating) for rating in ratings]
+
+    start = processed.get(season, 0)
+    new_rows = season_df.iloc[start:]
+    order = np.argsort(new_rows["날짜"].to_numpy(), kind="stable")
+
+    # 처음 등장한 팀: 첫 시즌이면 기본값, 이후 시즌이면 승격 팀으로 보고 낮게 시작
+    start_rating = params["initial"] + (params["promoted_offset"] if ratings else 0.0)
+    home_ids = np.empty(len(new_rows), dtype=np.int64)
+    away_ids = np.empty(len(new_rows), dtype=np.int64)
+    for ids, col in ((home_ids, "홈 팀"), (away_ids, "원정 팀")):
+        for pos, team in enumerate(new_rows[col].astype(str)):
+            if team not in teams:
+                teams[team] = len(ratings)
+                ratings.append(start_rating)
+            ids[pos] = teams[team]
+
+    scores = new_rows["경기 결과"].astype(str).map(RESULT_SCORES).to_numpy(dtype=np.float64)
+    pre_home = np.empty(len(new_rows))
+    pre_away = np.empty(len(new_rows))
+    k, home_advantage = params["k"], params["home_advantage"]
+    for pos in order:
+        home, away = home_ids[pos], away_ids[pos]
+        pre_home[pos], pre_away[pos] = ratings[home], ratings[away]
+        if np.isnan(scores[pos]):
+            continue
+        expected = 1 / (1 + 10 ** ((ratings[away] - ratings[home] - home_advantage) / 400))
+        delta = k * (scores[pos] - expected)
+        ratings[home] += delta
+        ratings[away] -= delta
+
+    processed[season] = len(season_df)
+    new_state = {"params": params, "teams": teams, "ratings": ratings, "processed": processed, "season": season}
+    return new_state, elo_probabilities(pre_home, pre_away, params)
+
+
+# 현재 레이팅 표 (높은 순)
+def rating_table(state):
+    table = pd.DataFrame({"구단": list(state["teams"]), "레이팅": [state["ratings"][i] for i in state["teams"].values()]})
+    return table.sort_values(by="레이팅", ascending=False, ignore_index=True)
+
+
+# 승부 예측 페이지용 확률 (calculate_win_probabilities와 같은 형식, 레이팅이 없는 팀이면 None)
+def rating_win_probabilities(state, home_team, away_team):
+    def get_probs(home, away):
+        if home not in state["teams"] or away not in state["teams"]:
+            return None
+        probs = elo_probabilities(state["ratings"][state["teams"][home]], state["ratings"][state["teams"][away]], state["params"])
+        return {"home_win": probs[0], "draw": probs[1], "away_win": probs[2]}
+
+    return get_probs(home_team, away_team), get_probs(away_team, home_team)
+
+
+# 승부 예측 게임용 승률 (무승부 제외)
+def rating_game_probabilities(state, team1, team2):
+    probs, _ = rating_win_probabilities(state, team1, team2)
+    if probs is None:
+        return 0.5, 0.5
+    p_home = probs["home_win"] / (probs["home_win"] + probs["away_win"])
+    return p_home, 1 - p_home
+
+
+# 경기별 로그 손실 (실제 결과에 준 확률의 -log)
+def log_loss(probs, outcomes):
+    picked = np.take_along_axis(probs, outcomes[:, None], axis=1)[:, 0]
+    return -np.log(np.clip(picked, 1e-15, 1))
+
+
+# 시즌별 Elo / 배당률 예측 로그 손실 비교 (배당률과 결과가 모두 있는 경기만)
+# matches는 build_match_store 결과, elo_probs는 같은 행 순서의 경기 전 Elo 확률
+def backtest_log_loss(matches, elo_probs):
+    odds_probs, _ = odds_to_probabilities(matches[ODDS_COLUMNS].to_numpy(dtype=np.float64))
+    outcomes = matches["경기 결과"].astype(str).map(RESULT_CODES).to_numpy(dtype=np.float64)
+    valid = np.isfinite(odds_probs).all(axis=1) & ~np.isnan(outcomes)
+    outcomes = outcomes[valid].astype(np.int64)
+
+    seasons = matches["시즌"].cat.codes.to_numpy()[valid]
+    n_seasons = len(matches["시즌"].cat.categories)
+    counts = np.bincount(seasons, minlength=n_seasons)
+    elo_loss = np.bincount(seasons, weights=log_loss(elo_probs[valid], outcomes), minlength=n_seasons)
+    odds_loss = np.bincount(seasons, weights=log_loss(odds_probs[valid], outcomes), minlength=n_seasons)
+
+    table = pd.DataFrame({
+        "시즌": list(matches["시즌"].cat.categories) + ["전체"],
+        "경기 수": np.append(counts, counts.sum()),
+        "Elo 로그 손실": np.append(elo_loss, elo_loss.sum()) / np.maximum(np.append(counts, counts.sum()), 1),
+        "배당률 로그 손실": np.append(odds_loss, odds_loss.sum()) / np.maximum(np.append(counts, counts.sum()), 1),
+    })
+    return table[table["경기 수"] > 0].reset_index(drop=True)
+
+
+# 토너먼트 시뮬레이션용 홈 팀 i가 원정 팀 j를 이길 확률 행렬 (무승부 제외, 레이팅이 없는 팀은 기본값)
+def rating_win_matrix(state, teams):
+    ratings = np.array([
+        state["ratings"][state["teams"][team]] if team in state["teams"] else state["params"]["initial"] for team in teams
+    ])
+    probs = elo_probabilities(ratings[:, None], ratings[None, :], state["params"])
+    return probs[..., 0] / (probs[..., 0] + probs[..., 2])
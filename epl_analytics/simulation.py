@@ -0,0 +1,128 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# 토너먼트 라운드 이름 (16강 진출 = 출전)
+ROUND_NAMES = ["16강", "8강", "4강", "결승", "우승"]
+
+
+# 홈 팀 i가 원정 팀 j를 이길 확률 행렬 (무승부를 제외하고 재정규화, 기록이 없으면 0.5)
+def bracket_win_matrix(probs, counts, team_ids):
+    team_ids = np.asarray(team_ids)
+    pair_probs = probs[np.ix_(team_ids, team_ids)]
+    home_win, away_win = pair_probs[:, :, 0], pair_probs[:, :, 2]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        win_matrix = home_win / (home_win + away_win)
+    played = counts[np.ix_(team_ids, team_ids)] > 0
+    return np.where(played & np.isfinite(win_matrix), win_matrix, 0.5)
+
+
+# 라운드마다 대진을 무작위로 섞는 토너먼트를 n_sims번 시뮬레이션
+# 반환값: (팀 수, 라운드 수) 도달 횟수
+def simulate_bracket(win_matrix, n_sims, seed=None, batch_size=50_000):
+    rng = np.random.default_rng(seed)
+    n_teams = win_matrix.shape[0]
+    n_rounds = int(np.log2(n_teams))
+    counts = np.zeros((n_teams, n_rounds + 1), dtype=np.int64)
+
+    for start in range(0, n_sims, batch_size):
+        size = min(batch_size, n_sims - start)
+        alive = np.broadcast_to(np.arange(n_teams), (size, n_teams))
+        counts[:, 0] += size
+
+        for round_idx in range(1, n_rounds + 1):
+            # 시뮬레이션마다 대진 섞기 → 앞쪽이 홈 팀
+            shuffle = np.argsort(rng.random(alive.shape), axis=1)
+            alive = np.take_along_axis(alive, shuffle, axis=1)
+            home, away = alive[:, 0::2], alive[:, 1::2]
+            home_wins = rng.random(home.shape) < win_matrix[home, away]
+            alive = np.where(home_wins, home, away)
+            counts[:, round_idx] += np.bincount(alive.ravel(), minlength=n_teams)
+
+    return counts
+
+
+def _simulate_chunk(args):
+    win_matrix, n_sims, seed = args
+    return simulate_bracket(win_matrix, n_sims, seed=seed)
+
+
+# 큰 시뮬레이션을 여러 프로세스로 나눠 실행 (각 프로세스는 독립된 난수 시드 사용)
+def simulate_bracket_parallel(win_matrix, n_sims, workers=None, seed=None):
+    workers = workers or os.cpu_count() or 1
+    chunk_sizes = [n_sims // workers + (i < n_sims % workers) for i in range(workers)]
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    jobs = [(win_matrix, size, child) for size, child in zip(chunk_sizes, seeds) if size > 0]
+    with ProcessPoolExecutor(max_workers=len(jobs)) as executor:
+        return sum(executor.map(_simulate_chunk, jobs))
+
+
+# 도달 횟수를 라운드별 확률 표로 변환 (우승 확률 내림차순)
+def bracket_probabilities(teams, counts, n_sims):
+    table = pd.DataFrame(counts / n_sims, columns=ROUND_NAMES[-counts.shape[1]:])
+    table.insert(0, "구단", list(teams))
+    return table.sort_values(by=list(table.columns[:0:-1]), ascending=False).reset_index(drop=True)
+
+
+# 남은 경기를 배당률 확률로 n_sims번 시뮬레이션해 최종 순위 분포 계산
+# base_points: 기준일까지의 팀별 승점, tiebreak: 승점 동률 시 순서 (기준일 득실차/득점 기준 순위 점수, 클수록 상위)
+# home_ids/away_ids/probs: 남은 경기의 팀 번호와 (홈 승, 무, 원정 승) 확률
+# 반환값: 시뮬레이션별 최종 승점 (n_sims, 팀 수), 팀별 최종 순위 횟수 (팀 수, 팀 수)
+def simulate_season(base_points, tiebreak, home_ids, away_ids, probs, n_sims, seed=None, batch_size=10_000):
+    rng = np.random.default_rng(seed)
+    n_teams, n_fixtures = len(base_points), len(home_ids)
+
+    # 경기 → 팀 승점 합산을 행렬 곱으로 처리하기 위한 원-핫 배열
+    home_onehot = np.zeros((n_fixtures, n_teams), dtype=np.float32)
+    away_onehot = np.zeros((n_fixtures, n_teams), dtype=np.float32)
+    home_onehot[np.arange(n_fixtures), home_ids] = 1
+    away_onehot[np.arange(n_fixtures), away_ids] = 1
+    cum_probs = np.cumsum(probs, axis=1).astype(np.float32)
+
+    final_points = np.empty((n_sims, n_teams), dtype=np.int16)
+    position_counts = np.zeros((n_teams, n_teams), dtype=np.int64)
+    tiebreak = np.asarray(tiebreak, dtype=np.float32) / (n_teams + 1)  # 0 이상 1 미만
+
+    for start in range(0, n_sims, batch_size):
+        size = min(batch_size, n_sims - start)
+        draws = rng.random((size, n_fixtures), dtype=np.float32)
+        home_win = draws < cum_probs[:, 0]
+        draw = ~home_win & (draws < cum_probs[:, 1])
+        away_win = ~(home_win | draw)
+
+        points = (
+            base_points
+            + (home_win * np.float32(3) + draw) @ home_onehot
+            + (away_win * np.float32(3) + draw) @ away_onehot
+        )
+        final_points[start:start + size] = np.rint(points)
+
+        order = np.argsort(-(points + tiebreak), axis=1)
+        positions = np.empty_like(order)
+        np.put_along_axis(positions, order, np.arange(n_teams)[None, :], axis=1)
+        team_ids = np.broadcast_to(np.arange(n_teams), positions.shape)
+        position_counts += np.bincount(
+            (team_ids * n_teams + positions).ravel(), minlength=n_teams * n_teams
+        ).reshape(n_teams, n_teams)
+
+    return final_points, position_counts
+
+
+# 시즌 예측 결과 요약표 (평균 순위 오름차순)
+def projection_table(teams, base_points, final_points, position_counts, relegation_places=3):
+    n_sims = final_points.shape[0]
+    position_probs = position_counts / n_sims
+    table = pd.DataFrame({
+        "구단": list(teams),
+        "현재 승점": np.asarray(base_points, dtype=np.int64),
+        "평균 승점": final_points.mean(axis=0),
+        "승점 (5%)": np.percentile(final_points, 5, axis=0),
+        "승점 (95%)": np.percentile(final_points, 95, axis=0),
+        "평균 순위": position_probs @ np.arange(1, len(teams) + 1),
+        "우승 확률": position_probs[:, 0],
+        "4위 이내 확률": position_probs[:, :4].sum(axis=1),
+        "강등 확률": position_probs[:, -relegation_places:].sum(axis=1),
+    })
+    return table.sort_values(by=["평균 순위", "평균 승점"], ascending=[True, False]).reset_index(drop=True)
@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+
+from .index import encode_teams
+
+
+# 리그 순위 계산 함수
+STANDINGS_COLUMNS = ["구단", "경기", "승", "무", "패", "득점", "실점", "득실차", "승점"]
+
+
+def calculate_standings(df):
+    teams, home_idx, away_idx = encode_teams(df)
+    result = df["경기 결과"].to_numpy()
+    return tally_standings(
+        teams, home_idx, away_idx, df["홈 팀 득점"].to_numpy(), df["원정 팀 득점"].to_numpy(), result == "H", result == "A"
+    )
+
+
+# 팀 번호/득점/승패 배열로 순위표 집계 (DataFrame과 압축 배열 형식이 같이 사용)
+def tally_standings(teams, home_idx, away_idx, home_score, away_score, home_win, away_win):
+    n_teams = len(teams)
+    draw = ~(home_win | away_win)
+
+    # 홈/원정 컬럼별로 집계한 뒤 합산
+    def tally(home_values, away_values):
+        home_total = np.bincount(home_idx, weights=home_values, minlength=n_teams)
+        away_total = np.bincount(away_idx, weights=away_values, minlength=n_teams)
+        return (home_total + away_total).astype(np.int64)
+
+    ones = np.ones(len(home_idx))
+    standings_df = pd.DataFrame({
+        "구단": teams,
+        "경기": tally(ones, ones),
+        "승": tally(home_win, away_win),
+        "무": tally(draw, draw),
+        "패": tally(away_win, home_win),
+        "득점": tally(home_score, away_score),
+        "실점": tally(away_score, home_score),
+    })
+    standings_df["득실차"] = standings_df["득점"] - standings_df["실점"]
+    standings_df["승점"] = standings_df["승"] * 3 + standings_df["무"]
+    standings_df = standings_df[STANDINGS_COLUMNS]
+    return standings_df.sort_values(by=["승점", "득실차", "득점"], ascending=False)
+
+
+# 날짜별 누적 순위 계산 함수
+CUMULATIVE_STATS = ["경기", "승", "무", "패", "득점", "실점", "승점"]
+
+
+# 경기별 홈/원정 팀의 기록 변화량 (경기 수 × 통계 수)
+def _standings_deltas(df):
+    home_score = df["홈 팀 득점"].to_numpy(dtype=np.int64)
+    away_score = df["원정 팀 득점"].to_numpy(dtype=np.int64)
+    result = df["경기 결과"].to_numpy()
+    home_win = (result == "H").astype(np.int64)
+    away_win = (result == "A").astype(np.int64)
+    draw = 1 - home_win - away_win
+    played = np.ones(len(df), dtype=np.int64)
+
+    home_delta = np.column_stack([played, home_win, draw, away_win, home_score, away_score, home_win * 3 + draw])
+    away_delta = np.column_stack([played, away_win, draw, home_win, away_score, home_score, away_win * 3 + draw])
+    return home_delta, away_delta
+
+
+# 날짜 × 팀 × 통계 누적 배열의 날짜별 순위 (승점 > 득실차 > 득점 순으로 정렬하기 위한 합성 키)
+def _standings_positions(cube):
+    goals_for = cube[:, :, CUMULATIVE_STATS.index("득점")]
+    goals_bound = int(goals_for[-1].sum()) + 1  # 마지막 날짜까지의 총 득점
+    points = cube[:, :, CUMULATIVE_STATS.index("승점")]
+    goal_diff = goals_for - cube[:, :, CUMULATIVE_STATS.index("실점")]
+    sort_key = (points * (2 * goals_bound + 1) + goal_diff + goals_bound) * (goals_bound + 1) + goals_for
+    order = np.argsort(-sort_key, axis=1, kind="stable")
+    positions = np.empty_like(order)
+    np.put_along_axis(positions, order, np.arange(1, cube.shape[1] + 1)[None, :], axis=1)
+    return positions
+
+
+def build_standings_cube(df):
+    teams, home_idx, away_idx = encode_teams(df)
+    dates, date_idx = np.unique(df["날짜"].to_numpy(), return_inverse=True)
+    home_delta, away_delta = _standings_deltas(df)
+
+    # 날짜 × 팀 × 통계 배열에 한 번에 더한 뒤 날짜 방향으로 누적
+    daily = np.zeros((len(dates), len(teams), len(CUMULATIVE_STATS)), dtype=np.int64)
+    np.add.at(daily, (date_idx, home_idx), home_delta)
+    np.add.at(daily, (date_idx, away_idx), away_delta)
+    cube = np.cumsum(daily, axis=0)
+
+    return pd.DatetimeIndex(dates), teams, cube.astype(np.int16), _standings_positions(cube).astype(np.int16)
+
+
+# 끝에 추가된 경기(new_rows, 팀 번호 home_idx/away_idx)만 반영해 누적 배열을 이어 붙임
+# 추가된 경기가 마지막 날짜 이후면 새 날짜만, 마지막 날짜와 같으면 그 날짜부터 다시 계산
+# 마지막 날짜보다 앞선 경기가 있으면 None (전체를 다시 계산해야 함)
+def extend_standings_cube(standings_cube, new_rows, home_idx, away_idx):
+    dates, teams, cube, positions = standings_cube
+    if len(new_rows) == 0:
+        return standings_cube
+    new_dates, date_idx = np.unique(new_rows["날짜"].to_numpy(), return_inverse=True)
+    last_date = dates.to_numpy()[-1]
+    if new_dates[0] < last_date:
+        return None
+
+    keep = len(dates) - 1 if new_dates[0] == last_date else len(dates)
+    base = cube[keep - 1].astype(np.int64) if keep else np.zeros(cube.shape[1:], dtype=np.int64)
+    daily = np.zeros((len(new_dates), len(teams), len(CUMULATIVE_STATS)), dtype=np.int64)
+    if keep < len(dates):
+        daily[0] = cube[-1] - base  # 마지막 날짜에 이미 반영된 경기
+    home_delta, away_delta = _standings_deltas(new_rows)
+    np.add.at(daily, (date_idx, home_idx), home_delta)
+    np.add.at(daily, (date_idx, away_idx), away_delta)
+    new_layers = base + np.cumsum(daily, axis=0)
+
+    return (
+        dates[:keep].append(pd.DatetimeIndex(new_dates)),
+        teams,
+        np.concatenate([cube[:keep], new_layers.astype(np.int16)]),
+        np.concatenate([positions[:keep], _standings_positions(new_layers).astype(np.int16)]),
+    )
+
+
+# 누적 배열에서 특정 날짜의 순위표 추출
+def standings_at(teams, cube, positions, date_pos):
+    snapshot = pd.DataFrame(cube[date_pos], columns=CUMULATIVE_STATS).astype(np.int64)
+    snapshot.insert(0, "구단", teams)
+    snapshot["득실차"] = snapshot["득점"] - snapshot["실점"]
+    snapshot = snapshot[STANDINGS_COLUMNS]
+    return snapshot.iloc[np.argsort(positions[date_pos])]
@@ -0,0 +1,83 @@
+import functools
+import json
+import threading
+import time
+from datetime import datetime, timezone
+
+# 스크립트 재실행(rerun)마다 단계별 소요 시간과 캐시 적중/미스를 기록
+# Streamlit은 세션마다 별도 스레드에서 스크립트를 실행하므로 스레드별로 상태를 둠
+_state = threading.local()
+
+
+def start_rerun(enabled):
+    _state.enabled = enabled
+    _state.started = _state.last = time.perf_counter()
+    _state.stages = []
+    _state.cache = {}
+
+
+def enabled():
+    return getattr(_state, "enabled", False)
+
+
+# 직전 체크포인트 이후 경과 시간을 name 단계로 기록
+def checkpoint(name):
+    if not enabled():
+        return
+    now = time.perf_counter()
+    _state.stages.append((name, now - _state.last))
+    _state.last = now
+
+
+def _count(name, field):
+    if enabled():
+        stats = _state.cache.setdefault(name, {"calls": 0, "misses": 0})
+        stats[field] += 1
+
+
+# 캐시 데코레이터(st.cache_data 등)를 감싸 호출 수와 미스(본문 실행) 수를 셈
+def tracked_cache(cache_decorator, name=None):
+    def wrap(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def body(*args, **kwargs):
+            _count(label, "misses")
+            return fn(*args, **kwargs)
+
+        cached = cache_decorator(body)
+
+        @functools.wraps(fn)
+        def call(*args, **kwargs):
+            _count(label, "calls")
+            return cached(*args, **kwargs)
+
+        call.clear = cached.clear
+        return call
+
+    return wrap
+
+
+# 이번 재실행의 기록 (비활성 상태면 None)
+def summary(**meta):
+    if not enabled():
+        return None
+    stages = {}
+    for name, seconds in _state.stages:
+        stages[name] = stages.get(name, 0) + seconds * 1000
+    cache = {
+        name: {"calls": stats["calls"], "hits": stats["calls"] - stats["misses"], "misses": stats["misses"]}
+        for name, stats in _state.cache.items()
+    }
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+        **meta,
+        "total_ms": (time.perf_counter() - _state.started) * 1000,
+        "stages_ms": stages,
+        "cache": cache,
+    }
+
+
+def append_log(record, path):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")